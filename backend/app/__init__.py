@@ -1,7 +1,27 @@
 import sys
-from typing import Any
+from typing import Any, ForwardRef
+
+
+def _v1_shim_is_broken() -> bool:
+    """
+    The pydantic.v1 shim used by spaCy/thinc breaks on interpreters whose
+    ForwardRef._evaluate signature it predates (Python 3.12.4+). Only patch
+    when that is actually the case, so healthy installs keep the fast path.
+    """
+    try:
+        from pydantic.v1.typing import evaluate_forwardref
+    except ImportError:
+        return False
+    try:
+        evaluate_forwardref(ForwardRef("int"), {}, {})
+        return False
+    except Exception:
+        return True
+
 
 def apply_pydantic_patch():
+    if not _v1_shim_is_broken():
+        return
     try:
         # Patch schema enforcement globally
         import pydantic.v1.schema
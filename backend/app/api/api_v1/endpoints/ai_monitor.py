@@ -2,13 +2,18 @@
 AI Monitor API Endpoints
 Full video analysis with YOLOv8 object detection and Whisper transcription.
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from app.db.session import SessionLocal
+from app.api.deps import get_db
+from app.api.http_cache import cached_json
 from app.models import database as models
 from app.services.cv_service import cv_service
 from app.services.audio_service import audio_service
+from app.services.media_probe import probe_video, apply_probe
 from app.core.config import settings
+import asyncio
+import json
 import os
 import logging
 
@@ -17,30 +22,36 @@ router = APIRouter()
 
 
 @router.post("/analyze-full/{take_id}")
-async def analyze_full(take_id: int):
+async def analyze_full(take_id: int, db: Session = Depends(get_db)):
     """
     Complete video analysis with YOLO object detection + Whisper transcription.
     Returns comprehensive metadata, timestamped detections, and transcript segments.
     """
-    db = SessionLocal()
+    take = db.get(models.Take, take_id)
+    if not take:
+        raise HTTPException(status_code=404, detail=f"Take {take_id} not found")
+    file_name = take.file_name
+    # Analysis takes minutes; hand the connection back to the pool meanwhile
+    db.close()
+    
+    video_path = os.path.join(settings.STORAGE_PATH, file_name)
+    if not os.path.exists(video_path):
+        raise HTTPException(status_code=404, detail=f"Video file not found: {file_name}")
+    
     try:
-        take = db.query(models.Take).filter(models.Take.id == take_id).first()
-        if not take:
-            raise HTTPException(status_code=404, detail=f"Take {take_id} not found")
-        
-        video_path = os.path.join(settings.STORAGE_PATH, take.file_name)
-        if not os.path.exists(video_path):
-            raise HTTPException(status_code=404, detail=f"Video file not found: {take.file_name}")
+        logger.info(f"Starting full AI analysis for take {take_id}: {file_name}")
         
-        logger.info(f"Starting full AI analysis for take {take_id}: {take.file_name}")
-        
-        # Run both analyses
-        cv_result = await cv_service.analyze_video_full(video_path)
-        audio_result = await audio_service.analyze_audio_full(video_path)
+        # Run both analyses concurrently: latency ~ max(CV, audio) instead of the sum.
+        # VRAM is bounded where the models run (YOLO replica pool, Whisper lock),
+        # so probing and decode are never serialized behind another request.
+        cv_result, audio_result = await asyncio.gather(
+            cv_service.analyze_video_full(video_path),
+            audio_service.analyze_audio_full(video_path)
+        )
         
         result = {
             "take_id": take_id,
-            "file_name": take.file_name,
+            "file_name": file_name,
             "video_analysis": cv_result,
             "audio_analysis": audio_result,
             "combined_timeline": _merge_timelines(cv_result, audio_result)
@@ -49,109 +60,137 @@ async def analyze_full(take_id: int):
         logger.info(f"Full AI analysis complete for take {take_id}")
         return result
         
-    except HTTPException:
-        raise
     except Exception as e:
         logger.error(f"Full analysis failed for take {take_id}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        db.close()
+
+
+@router.get("/analyze-stream/{take_id}")
+async def analyze_stream(take_id: int, db: Session = Depends(get_db)):
+    """
+    Streams YOLO detections as NDJSON, one line per sampled frame, so long
+    takes show partial results without buffering the whole analysis.
+    """
+    take = db.get(models.Take, take_id)
+    if not take:
+        raise HTTPException(status_code=404, detail=f"Take {take_id} not found")
+    file_name, fps, frame_count = take.file_name, take.fps, take.frame_count
+    db.close()
+
+    video_path = os.path.join(settings.STORAGE_PATH, file_name)
+    if not os.path.exists(video_path):
+        raise HTTPException(status_code=404, detail=f"Video file not found: {file_name}")
+    if not fps or not frame_count:
+        probe = await asyncio.to_thread(probe_video, video_path)
+        if not probe:
+            raise HTTPException(status_code=422, detail=f"Could not read video metadata: {file_name}")
+        fps, frame_count = probe["fps"], probe["frame_count"]
+
+    async def _ndjson():
+        async for entry in cv_service.iter_detections(video_path, fps, frame_count):
+            yield json.dumps({
+                "timestamp": entry["timestamp"],
+                "frame": entry["frame"],
+                "objects": sorted({name for name, _ in entry["detections"]}),
+                "detections": [{"class": name, "confidence": round(conf, 3)} for name, conf in entry["detections"]]
+            }) + "\n"
+
+    return StreamingResponse(_ndjson(), media_type="application/x-ndjson")
 
 
 @router.get("/metadata/{take_id}")
-async def get_metadata(take_id: int):
+def get_metadata(take_id: int, request: Request, db: Session = Depends(get_db)):
     """
     Get video technical metadata without running full analysis.
     Faster endpoint for quick metadata display.
     """
-    db = SessionLocal()
-    try:
-        take = db.query(models.Take).filter(models.Take.id == take_id).first()
-        if not take:
-            raise HTTPException(status_code=404, detail=f"Take {take_id} not found")
-        
-        video_path = os.path.join(settings.STORAGE_PATH, take.file_name)
-        
-        metadata = {
-            "take_id": take_id,
-            "file_name": take.file_name,
-            "exists": os.path.exists(video_path)
-        }
-        
-        if metadata["exists"]:
-            try:
-                import cv2
-                cap = cv2.VideoCapture(video_path)
-                if cap.isOpened():
-                    metadata["fps"] = round(cap.get(cv2.CAP_PROP_FPS), 2)
-                    metadata["frame_count"] = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-                    metadata["width"] = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-                    metadata["height"] = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-                    metadata["duration"] = round(metadata["frame_count"] / metadata["fps"], 2) if metadata["fps"] > 0 else 0
-                    fourcc = int(cap.get(cv2.CAP_PROP_FOURCC))
-                    metadata["codec"] = "".join([chr((fourcc >> 8 * i) & 0xFF) for i in range(4)]).strip()
-                    cap.release()
-                    
-                file_stats = os.stat(video_path)
-                metadata["file_size_mb"] = round(file_stats.st_size / (1024 * 1024), 2)
-            except Exception as e:
-                metadata["error"] = str(e)
-        
-        return metadata
-        
-    finally:
-        db.close()
+    take = db.get(models.Take, take_id)
+    if not take:
+        raise HTTPException(status_code=404, detail=f"Take {take_id} not found")
+    
+    video_path = os.path.join(settings.STORAGE_PATH, take.file_name)
+    
+    metadata = {
+        "take_id": take_id,
+        "file_name": take.file_name,
+        "exists": os.path.exists(video_path)
+    }
+    
+    if metadata["exists"]:
+        try:
+            if take.fps is None:
+                # Legacy row uploaded before probing; probe once and persist
+                probe = probe_video(video_path)
+                if probe:
+                    apply_probe(take, probe)
+                    db.commit()
+            if take.fps is not None:
+                metadata["fps"] = take.fps
+                metadata["frame_count"] = take.frame_count
+                metadata["width"] = take.width
+                metadata["height"] = take.height
+                metadata["duration"] = take.duration
+                metadata["codec"] = take.codec
+
+            metadata["file_size_mb"] = round(os.path.getsize(video_path) / (1024 * 1024), 2)
+        except Exception as e:
+            metadata["error"] = str(e)
+    
+    return cached_json(request, metadata, max_age=300)
 
 
 @router.get("/status/{take_id}")
-async def get_analysis_status(take_id: int):
+def get_analysis_status(take_id: int, request: Request, db: Session = Depends(get_db)):
     """
     Check if a take has existing AI analysis results.
     """
-    db = SessionLocal()
-    try:
-        take = db.query(models.Take).filter(models.Take.id == take_id).first()
-        if not take:
-            raise HTTPException(status_code=404, detail=f"Take {take_id} not found")
-        
-        has_metadata = take.ai_metadata is not None and len(take.ai_metadata) > 0
-        
-        return {
-            "take_id": take_id,
-            "has_analysis": has_metadata,
-            "confidence_score": take.confidence_score if has_metadata else None
-        }
-    finally:
-        db.close()
+    take = db.get(models.Take, take_id)
+    if not take:
+        raise HTTPException(status_code=404, detail=f"Take {take_id} not found")
+    
+    has_metadata = take.ai_metadata is not None and len(take.ai_metadata) > 0
+    
+    # Flips when processing finishes, so always revalidate
+    return cached_json(request, {
+        "take_id": take_id,
+        "has_analysis": has_metadata,
+        "confidence_score": take.confidence_score if has_metadata else None
+    }, max_age=0)
 
 
 def _merge_timelines(cv_result: dict, audio_result: dict) -> list:
     """
     Merge video detection timeline with audio transcript segments
     into a unified timeline for display.
+    Both inputs are already time-ordered, so a two-pointer merge into a
+    preallocated list replaces a sort.
     """
-    timeline = []
-    
-    # Add video detections
-    for entry in cv_result.get("timeline", []):
-        timeline.append({
-            "timestamp": entry["timestamp"],
-            "type": "detection",
-            "content": f"Detected: {', '.join(entry['objects'][:3])}",
-            "object_count": entry.get("object_count", 0)
-        })
-    
-    # Add audio segments
-    for seg in audio_result.get("segments", []):
-        timeline.append({
-            "timestamp": seg["start"],
-            "type": "transcript",
-            "content": seg["text"],
-            "end_time": seg["end"],
-            "confidence": seg.get("confidence", 0)
-        })
+    detections = cv_result.get("timeline", [])
+    segments = audio_result.get("segments", [])
+    n_det, n_seg = len(detections), len(segments)
+    timeline = [None] * (n_det + n_seg)
     
-    # Sort by timestamp
-    timeline.sort(key=lambda x: x["timestamp"])
+    i = j = 0
+    for k in range(n_det + n_seg):
+        # Detections win ties, matching the previous stable sort
+        if j >= n_seg or (i < n_det and detections[i]["timestamp"] <= segments[j]["start"]):
+            entry = detections[i]
+            timeline[k] = {
+                "timestamp": entry["timestamp"],
+                "type": "detection",
+                "content": "Detected: " + ", ".join(entry["objects"][:3]),
+                "object_count": entry.get("object_count", 0)
+            }
+            i += 1
+        else:
+            seg = segments[j]
+            timeline[k] = {
+                "timestamp": seg["start"],
+                "type": "transcript",
+                "content": seg["text"],
+                "end_time": seg["end"],
+                "confidence": seg.get("confidence", 0)
+            }
+            j += 1
     
     return timeline
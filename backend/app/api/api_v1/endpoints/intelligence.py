@@ -1,18 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from app.api import deps
+from app.api.http_cache import cached_json
 from app.models import database as models
 
 router = APIRouter()
 
 @router.get("/heatmap/{take_id}")
-def get_emotion_heatmap(take_id: int, db: Session = Depends(deps.get_db)):
-    take = db.query(models.Take).get(take_id)
+def get_emotion_heatmap(take_id: int, request: Request, db: Session = Depends(deps.get_db)):
+    take = db.get(models.Take, take_id)
     if not take:
         raise HTTPException(status_code=404, detail="Take not found")
 
     # Mock heatmap data (intensity over time)
-    return {
+    return cached_json(request, {
         "take_id": take_id,
         "data": [
             {"time": i, "intensity": 40 + (i % 20) + (take_id % 10)} 
@@ -20,7 +21,7 @@ def get_emotion_heatmap(take_id: int, db: Session = Depends(deps.get_db)):
         ],
         "primary_emotion": "Tension",
         "confidence": 0.88
-    }
+    }, max_age=60)
 
 @router.get("/risk")
 def get_reshoot_risk(db: Session = Depends(deps.get_db)):
@@ -35,8 +36,6 @@ def get_reshoot_risk(db: Session = Depends(deps.get_db)):
     }
 @router.get("/project-insights")
 def get_project_insights(db: Session = Depends(deps.get_db)):
-    takes = db.query(models.Take).all()
-    
     all_cues = []
     pacing_data = []
     
@@ -47,31 +46,46 @@ def get_project_insights(db: Session = Depends(deps.get_db)):
         "Mad Max": 2.1
     }
     
-    for take in takes:
-        meta = take.ai_metadata or {}
-        
-        # 1. Collect Vocal Cues
-        cues = meta.get("vocal_cues", [])
-        for cue in cues:
+    # 1. Collect Vocal Cues - newest takes first, stop once we have 10
+    cue_rows = (
+        db.query(
+            models.Take.id,
+            models.Take.file_name,
+            models.Take.confidence_score,
+            models.Take.ai_metadata["vocal_cues"]
+        )
+        .order_by(models.Take.id.desc())
+        .yield_per(500)
+    )
+    for take_id, file_name, confidence_score, cues in cue_rows:
+        for cue in cues or []:
             all_cues.append({
-                "take_id": take.id,
-                "take_name": take.file_name,
+                "take_id": take_id,
+                "take_name": file_name,
                 "cue": cue["cue"],
                 "text": cue["text"],
                 "timestamp": "00:00:00:00", # Mock TC for now
-                "confidence": take.confidence_score or 0.1
+                "confidence": confidence_score or 0.1
             })
-            
-        # 2. Collect Pacing
+        if len(all_cues) >= 10:
+            break
+    
+    # 2. Collect Pacing - only the 10 rows we display
+    pacing_rows = (
+        db.query(models.Take.number, models.Take.ai_metadata["pacing_signature"].as_float())
+        .order_by(models.Take.id)
+        .limit(10)
+    )
+    for number, pacing in pacing_rows:
         pacing_data.append({
-            "name": f"T{take.number}",
-            "current": meta.get("pacing_signature", 0.0),
+            "name": f"T{number}",
+            "current": pacing or 0.0,
             "target": signatures["The Dark Knight"]
         })
         
     return {
-        "vocal_cues": sorted(all_cues, key=lambda x: x["take_id"], reverse=True)[:10],
-        "pacing_comparison": pacing_data[:10],
+        "vocal_cues": all_cues[:10],
+        "pacing_comparison": pacing_data,
         "active_signature": "The Dark Knight",
         "recommendations": [
             {"title": "Pacing Consistency", "desc": "Current takes are 15% faster than 'The Dark Knight' reference signature."},
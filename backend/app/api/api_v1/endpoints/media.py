@@ -6,7 +6,9 @@ from app.schemas import models as schemas
 from app.models import database as models
 import shutil
 import os
+import asyncio
 from app.core.config import settings
+from app.services.media_probe import probe_video, apply_probe
 
 router = APIRouter()
 
@@ -51,6 +53,9 @@ async def upload_media(
         ai_metadata={},
         ai_reasoning={}
     )
+    probe = await asyncio.to_thread(probe_video, file_path)
+    if probe:
+        apply_probe(take, probe)
     db.add(take)
     db.commit()
     db.refresh(take)
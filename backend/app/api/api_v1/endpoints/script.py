@@ -4,6 +4,7 @@ from app.services.script_analysis_service import script_analysis_service
 from app.services.story_generator_service import story_generator_service
 import os
 import shutil
+from html import escape
 from tempfile import NamedTemporaryFile
 from pydantic import BaseModel
 
@@ -55,60 +56,85 @@ async def upload_script(file: UploadFile = File(...)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-def _generate_html_report(analysis: dict) -> str:
-    # Simple HTML generator for the user-readable report
-    html = f"""
+_REPORT_HEAD = """
     <html>
     <head><style>
-        body {{ font-family: sans-serif; line-height: 1.6; color: #333; max-width: 800px; margin: 40px auto; padding: 20px; }}
-        h1, h2, h3 {{ color: #1a56db; }}
-        .section {{ margin-bottom: 30px; border-bottom: 1px solid #eee; padding-bottom: 20px; }}
-        .scene {{ background: #f9fafb; padding: 15px; border-radius: 8px; margin-bottom: 15px; }}
-        .tag {{ display: inline-block; background: #e5edff; color: #1e40af; padding: 2px 8px; border-radius: 4px; font-size: 0.8em; margin-right: 5px; }}
+        body { font-family: sans-serif; line-height: 1.6; color: #333; max-width: 800px; margin: 40px auto; padding: 20px; }
+        h1, h2, h3 { color: #1a56db; }
+        .section { margin-bottom: 30px; border-bottom: 1px solid #eee; padding-bottom: 20px; }
+        .scene { background: #f9fafb; padding: 15px; border-radius: 8px; margin-bottom: 15px; }
+        .tag { display: inline-block; background: #e5edff; color: #1e40af; padding: 2px 8px; border-radius: 4px; font-size: 0.8em; margin-right: 5px; }
     </style></head>
     <body>
         <h1>Script Analysis Report: Interactive Production Insights</h1>
-        
+"""
+
+_REPORT_TAIL = """
+    </body>
+    </html>
+"""
+
+
+def _esc(value) -> str:
+    return escape(str(value))
+
+
+def _joined(items, sep: str = ", ") -> str:
+    return escape(sep.join(str(i) for i in items))
+
+
+def _generate_html_report(analysis: dict) -> str:
+    # Simple HTML generator for the user-readable report.
+    # Built as a list of parts joined once; script text is user-supplied, so
+    # every interpolated value is escaped.
+    parts = [_REPORT_HEAD]
+
+    parts.append("""
         <div class="section">
             <h2>Executive Summary</h2>
             <ul>
-                {"".join(f"<li>{item}</li>" for item in analysis['executive_summary'])}
-            </ul>
+""")
+    for item in analysis['executive_summary']:
+        parts.append(f"                <li>{_esc(item)}</li>\n")
+    parts.append("""            </ul>
         </div>
 
         <div class="section">
             <h2>Scene-by-Scene Breakdown</h2>
-            {"".join(f'''
-                <div class="scene">
-                    <h3>Scene {s['scene_number']}: {s['heading']}</h3>
-                    <p><strong>Summary:</strong> {s['summary']}</p>
-                    <p><strong>Strengths:</strong> {", ".join(s['strengths'])}</p>
-                    <p><strong>Suggested Shots:</strong> {", ".join(s['suggested_shots'])}</p>
-                    <p><strong>Staging:</strong> {", ".join(s['suggested_blocking'])}</p>
+""")
+    for s in analysis['scenes']:
+        parts.append(f"""                <div class="scene">
+                    <h3>Scene {_esc(s['scene_number'])}: {_esc(s['heading'])}</h3>
+                    <p><strong>Summary:</strong> {_esc(s['summary'])}</p>
+                    <p><strong>Strengths:</strong> {_joined(s['strengths'])}</p>
+                    <p><strong>Suggested Shots:</strong> {_joined(s['suggested_shots'])}</p>
+                    <p><strong>Staging:</strong> {_joined(s['suggested_blocking'])}</p>
                 </div>
-            ''' for s in analysis['scenes'])}
-        </div>
+""")
+    parts.append("""        </div>
 
         <div class="section">
             <h2>Character Arcs</h2>
-            {"".join(f'''
-                <div>
-                    <h3>{c['name']}</h3>
-                    <p><strong>Arc:</strong> {c['arc']}</p>
-                    <p><strong>Subtext:</strong> {"; ".join(c['subtext_notes'])}</p>
+""")
+    for c in analysis['character_insights']:
+        parts.append(f"""                <div>
+                    <h3>{_esc(c['name'])}</h3>
+                    <p><strong>Arc:</strong> {_esc(c['arc'])}</p>
+                    <p><strong>Subtext:</strong> {_joined(c['subtext_notes'], "; ")}</p>
                 </div>
-            ''' for c in analysis['character_insights'])}
-        </div>
-        
+""")
+
+    notes = analysis['production_notes']
+    parts.append(f"""        </div>
+
         <div class="section">
             <h2>Production Notes</h2>
-            <p><strong>Budget Tier:</strong> {analysis['production_notes']['estimated_budget_tier']}</p>
-            <p><strong>Locations:</strong> {", ".join(analysis['production_notes']['locations'])}</p>
-            <p><strong>Props:</strong> {", ".join(analysis['production_notes']['props'])}</p>
-            <p><strong>Wardrobe:</strong> {", ".join(analysis['production_notes']['wardrobe'])}</p>
+            <p><strong>Budget Tier:</strong> {_esc(notes['estimated_budget_tier'])}</p>
+            <p><strong>Locations:</strong> {_joined(notes['locations'])}</p>
+            <p><strong>Props:</strong> {_joined(notes['props'])}</p>
+            <p><strong>Wardrobe:</strong> {_joined(notes['wardrobe'])}</p>
         </div>
+""")
 
-    </body>
-    </html>
-    """
-    return html
+    parts.append(_REPORT_TAIL)
+    return "".join(parts)
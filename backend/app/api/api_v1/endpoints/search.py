@@ -1,12 +1,14 @@
 """
 Semantic Search API Endpoints for SmartCut AI
 """
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Request
+from sqlalchemy import case, func, literal, or_, text
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any, Optional
 import os
 from pydantic import BaseModel
 from app.api.deps import get_db
+from app.api.http_cache import cached_json
 from app.services.semantic_search_service import semantic_search_service, SearchResult
 from app.services.intent_embedding_service import intent_embedding_service
 from app.services.query_expansion_service import query_expansion_service
@@ -81,7 +83,7 @@ class FeedbackRequest(BaseModel):
 
 # Endpoints
 @router.post("/intent", response_model=SearchResponse)
-async def search_by_intent(request: SearchRequest, db: Session = Depends(get_db)):
+def search_by_intent(request: SearchRequest, db: Session = Depends(get_db)):
     """
     Search footage by editorial intent using semantic similarity.
     
@@ -123,7 +125,7 @@ async def search_by_intent(request: SearchRequest, db: Session = Depends(get_db)
 
 
 @router.post("/unified", response_model=UnifiedSearchResponse)
-async def unified_search(request: SearchRequest, db: Session = Depends(get_db)):
+def unified_search(request: SearchRequest, db: Session = Depends(get_db)):
     """
     Unified search across all data sources: transcripts, descriptions, emotions, and filenames.
     Uses LLM-like query expansion so "FIR" and "First Incident Report" yield same results.
@@ -138,74 +140,33 @@ async def unified_search(request: SearchRequest, db: Session = Depends(get_db)):
     expanded_terms = expansion["all_search_terms"]
     query_emotions = query_expansion_service.get_emotion_mappings(request.query)
     
-    # Search database directly
-    takes = db.query(models.Take).all()
+    # Score every take in SQL and only pull the top-K rows back into Python
+    score, matches = _unified_score_expr(expanded_terms, query_emotions)
+    rows = (
+        db.query(models.Take, score)
+        .filter(matches)
+        .order_by(score.desc(), models.Take.id)
+        .limit(request.top_k)
+        .all()
+    )
     
     results = []
-    for take in takes:
+    for take, take_score in rows:
         meta = take.ai_metadata or {}
         cv_data = meta.get("cv", {})
         audio_data = meta.get("audio", {})
         
-        # Gather all searchable text
-        transcript = audio_data.get("transcript", "").lower()
-        video_desc = cv_data.get("video_description", "").lower()
-        audio_desc = audio_data.get("audio_description", "").lower()
-        emotion = meta.get("emotion", "neutral").lower()
-        fname = (take.file_name or "").lower()
-        
-        # Combined text for matching
-        combined = f"{transcript} {video_desc} {audio_desc} {fname}"
-        
-        # Calculate match score
-        score = 0
-        match_sources = []
-        
-        for term in expanded_terms:
-            if term in transcript:
-                score += 6
-                if "dialog/transcript" not in match_sources:
-                    match_sources.append("dialog/transcript")
-            if term in video_desc:
-                score += 4
-                if "video_description" not in match_sources:
-                    match_sources.append("video_description")
-            if term in audio_desc:
-                score += 4
-                if "audio_description" not in match_sources:
-                    match_sources.append("audio_description")
-            if term in emotion or term == emotion:
-                score += 5
-                if "emotion" not in match_sources:
-                    match_sources.append("emotion")
-            if term in fname:
-                score += 3
-                if "filename" not in match_sources:
-                    match_sources.append("filename")
-        
-        # Bonus for emotion category match
-        if query_emotions and emotion in query_emotions:
-            score += 8
-            if "emotion_category" not in match_sources:
-                match_sources.append("emotion_category")
-        
-        if score > 0:
-            confidence = min(0.98, 0.4 + (score * 0.04))
-            results.append(UnifiedSearchResult(
-                take_id=take.id,
-                file_name=take.file_name or "",
-                video_url=f"/media_files/{os.path.basename(take.file_path)}" if take.file_path else "",
-                confidence=confidence,
-                match_sources=match_sources,
-                transcript_snippet=audio_data.get("transcript", "")[:200],
-                emotion=emotion,
-                video_description=cv_data.get("video_description", "")[:200],
-                audio_description=audio_data.get("audio_description", "")[:200]
-            ))
-    
-    # Sort by confidence
-    results.sort(key=lambda x: x.confidence, reverse=True)
-    results = results[:request.top_k]
+        results.append(UnifiedSearchResult(
+            take_id=take.id,
+            file_name=take.file_name or "",
+            video_url=f"/media_files/{os.path.basename(take.file_path)}" if take.file_path else "",
+            confidence=min(0.98, 0.4 + (take_score * 0.04)),
+            match_sources=_match_sources(take, expanded_terms, query_emotions),
+            transcript_snippet=(audio_data.get("transcript") or "")[:200],
+            emotion=(meta.get("emotion") or "neutral").lower(),
+            video_description=(cv_data.get("video_description") or "")[:200],
+            audio_description=(audio_data.get("audio_description") or "")[:200]
+        ))
     
     return UnifiedSearchResponse(
         query=request.query,
@@ -216,6 +177,100 @@ async def unified_search(request: SearchRequest, db: Session = Depends(get_db)):
     )
 
 
+
+# Unified search field weights: (match source label, weight)
+_UNIFIED_FIELDS = [
+    ("dialog/transcript", 6),
+    ("video_description", 4),
+    ("audio_description", 4),
+    ("emotion", 5),
+    ("filename", 3),
+]
+_EMOTION_CATEGORY_BONUS = 8
+
+
+def _unified_columns():
+    """SQL expressions for the searchable text of a take, in _UNIFIED_FIELDS order."""
+    meta = models.Take.ai_metadata
+    return [
+        func.coalesce(meta[("audio", "transcript")].as_string(), ""),
+        func.coalesce(meta[("cv", "video_description")].as_string(), ""),
+        func.coalesce(meta[("audio", "audio_description")].as_string(), ""),
+        func.coalesce(meta["emotion"].as_string(), "neutral"),
+        func.coalesce(models.Take.file_name, ""),
+    ]
+
+
+def ensure_search_indexes(bind) -> None:
+    """
+    Create pg_trgm GIN indexes on the exact expressions used by unified search.
+    The match predicate is an OR of ILIKEs over these expressions, which the
+    planner can answer with a BitmapOr over the indexes instead of scoring
+    every row. No-op on non-Postgres databases.
+    """
+    if bind.dialect.name != "postgresql":
+        return
+    
+    with bind.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        for (label, _), column in zip(_UNIFIED_FIELDS, _unified_columns()):
+            expr = column.compile(dialect=bind.dialect, compile_kwargs={"literal_binds": True})
+            name = "takes_search_trgm_" + label.replace("/", "_")
+            conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON takes USING GIN (({expr}) gin_trgm_ops)"))
+
+
+def _like_pattern(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _unified_score_expr(expanded_terms, query_emotions):
+    """
+    Build the unified match score and its match predicate as SQL expressions
+    so filtering, ranking and LIMIT all happen in the database.
+    The score is positive exactly when the predicate holds; filter on the
+    predicate, since Postgres can't use an index for a condition on the sum.
+    """
+    columns = _unified_columns()
+    weighted = []
+    for term in expanded_terms:
+        pattern = _like_pattern(term)
+        for column, (_, weight) in zip(columns, _UNIFIED_FIELDS):
+            weighted.append((column.ilike(pattern, escape="\\"), weight))
+    
+    # Exact (wildcard-free) ILIKEs: a case-insensitive equality the trigram index also serves
+    for emotion in query_emotions or ():
+        weighted.append((columns[3].ilike(_like_pattern(emotion)[1:-1], escape="\\"), _EMOTION_CATEGORY_BONUS))
+    
+    if not weighted:
+        return literal(0), literal(False)
+    score = sum((case((condition, weight), else_=0) for condition, weight in weighted), literal(0))
+    return score, or_(*(condition for condition, _ in weighted))
+
+
+def _match_sources(take, expanded_terms, query_emotions) -> List[str]:
+    """Tag which fields of a (top-K) take matched the expanded query."""
+    meta = take.ai_metadata or {}
+    cv_data = meta.get("cv", {})
+    audio_data = meta.get("audio", {})
+    emotion = (meta.get("emotion") or "neutral").lower()
+    fields = [
+        (audio_data.get("transcript") or "").lower(),
+        (cv_data.get("video_description") or "").lower(),
+        (audio_data.get("audio_description") or "").lower(),
+        emotion,
+        (take.file_name or "").lower(),
+    ]
+    
+    match_sources = [
+        label for (label, _), text in zip(_UNIFIED_FIELDS, fields)
+        if query_expansion_service.match_terms(expanded_terms, text)
+    ]
+    if query_emotions and emotion in query_emotions:
+        match_sources.append("emotion_category")
+    return match_sources
+
+
 @router.get("/suggestions")
 async def get_query_suggestions(
     q: str = Query("", description="Partial query for suggestions")
@@ -228,14 +283,27 @@ async def get_query_suggestions(
 
 
 @router.get("/explain/{result_id}")
-async def explain_result(result_id: int):
+def explain_result(result_id: int, request: Request, db: Session = Depends(get_db)):
     """
     Get detailed explanation for a specific search result.
     """
-    if result_id < 0 or result_id >= len(semantic_search_service.metadata):
-        raise HTTPException(status_code=404, detail="Result not found")
-    
-    meta = semantic_search_service.metadata[result_id]
+    # result_id is the moment_embeddings primary key, shared by every worker
+    moment = db.get(models.MomentEmbedding, result_id)
+    if moment is not None:
+        meta = {
+            "take_id": moment.take_id,
+            "start_time": moment.start_time,
+            "end_time": moment.end_time,
+            "emotion_label": moment.emotion_label,
+            "transcript_snippet": moment.transcript_snippet or "",
+            "audio_features": moment.audio_features or {},
+            "timing_data": moment.timing_data or {}
+        }
+    else:
+        # Moments that never reached the database carry negative ids
+        meta = semantic_search_service.unmirrored_metadata(result_id)
+        if meta is None:
+            raise HTTPException(status_code=404, detail="Result not found")
     
     # Generate detailed explanation
     explanation = {
@@ -254,7 +322,7 @@ async def explain_result(result_id: int):
         "explanation_text": _generate_explanation_text(meta)
     }
     
-    return explanation
+    return cached_json(request, explanation, max_age=300)
 
 
 def _generate_explanation_text(meta: Dict) -> str:
@@ -306,12 +374,12 @@ async def submit_feedback(request: FeedbackRequest, db: Session = Depends(get_db
 
 
 @router.get("/stats")
-async def get_search_stats():
+async def get_search_stats(request: Request):
     """
     Get statistics about the search index.
     """
-    return {
+    return cached_json(request, {
         "total_indexed_moments": semantic_search_service.index.ntotal if semantic_search_service.index else 0,
         "embedding_dimension": semantic_search_service.dimension,
         "index_status": "ready" if semantic_search_service.index else "not_initialized"
-    }
+    }, max_age=30)
@@ -0,0 +1,132 @@
+"""
+HTTP Caching Helpers
+Content-hash ETags and Cache-Control for read-mostly endpoints, so browsers
+and edge caches can revalidate with a 304 instead of re-downloading.
+Also the cached media mount and path-aware gzip used by main.py.
+"""
+import hashlib
+import json
+import mimetypes
+import os
+from typing import Any, Dict, Iterable
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _encode(payload: Any) -> bytes:
+    data = jsonable_encoder(payload)
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def cached_json(request: Request, payload: Any, max_age: int = 60) -> Response:
+    """
+    Serialize payload with a strong ETag. Returns 304 when the client's
+    If-None-Match already has this representation.
+    max_age=0 forces revalidation on every use (still saves the body).
+    """
+    body = _encode(payload)
+    etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+    cache_control = f"public, max-age={max_age}" if max_age > 0 else "no-cache"
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")) or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+# Precompressed siblings checked in preference order
+_PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+
+def _accepted_encodings(header: str) -> Dict[str, float]:
+    """Parse Accept-Encoding into {coding: q}; a malformed q counts as 0."""
+    codings = {}
+    for part in header.split(","):
+        coding, *params = (p.strip() for p in part.split(";"))
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        codings[coding.lower()] = q
+    return codings
+
+
+def _accepts(codings: Dict[str, float], coding: str) -> bool:
+    # An explicit entry, including q=0, overrides the "*" wildcard
+    return codings.get(coding, codings.get("*", 0.0)) > 0
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles with Cache-Control on every file and precompressed .br/.gz
+    siblings served when the client accepts them. Starlette already sets the
+    (mtime, size) ETag and answers If-None-Match with 304.
+    Uploads are stored by file name and may be replaced, so responses are
+    revalidated after max_age rather than marked immutable.
+    """
+
+    def __init__(self, *args, max_age: int = 3600, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache_control = f"public, max-age={max_age}"
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope, status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        accepted = _accepted_encodings(request_headers.get("accept-encoding", ""))
+        media_type = mimetypes.guess_type(str(full_path))[0] or "text/plain"
+
+        serve_path, serve_stat, encoding = full_path, stat_result, None
+        for candidate, suffix in _PRECOMPRESSED:
+            if not _accepts(accepted, candidate):
+                continue
+            try:
+                serve_stat = os.stat(f"{full_path}{suffix}")
+            except OSError:
+                continue
+            serve_path, encoding = f"{full_path}{suffix}", candidate
+            break
+
+        response = FileResponse(serve_path, status_code=status_code, stat_result=serve_stat, media_type=media_type)
+        response.headers["Cache-Control"] = self.cache_control
+        response.headers["Vary"] = "Accept-Encoding"
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """
+    GZip for API responses, skipping path prefixes whose bodies are already
+    compressed (media) or must reach the client unbuffered (NDJSON streams).
+    """
+
+    def __init__(self, app, exclude_prefixes: Iterable[str] = (), **kwargs):
+        super().__init__(app, **kwargs)
+        self.exclude_prefixes = tuple(exclude_prefixes)
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and scope["path"].startswith(self.exclude_prefixes):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
@@ -1,4 +1,6 @@
-from sqlalchemy import create_engine
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
@@ -15,6 +17,31 @@ else:
     )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def warm_pool(bind=engine) -> int:
+    """
+    Open pool_size connections up front so the first requests don't pay
+    connect/auth latency. All are held until every one is open, otherwise
+    the pool would hand back the same connection each time. Returns the count.
+    """
+    if bind.dialect.name == "sqlite":
+        return 0  # Local file, nothing to warm
+    size_fn = getattr(bind.pool, "size", None)
+    size = size_fn() if callable(size_fn) else 0
+    if size <= 0:
+        return 0
+
+    def _open(_):
+        conn = bind.connect()
+        conn.execute(text("SELECT 1"))
+        return conn
+
+    with ThreadPoolExecutor(max_workers=size) as ex:
+        connections = list(ex.map(_open, range(size)))
+    for conn in connections:
+        conn.close()  # Returned to the pool, still connected
+    return len(connections)
+
 def get_db():
     db = SessionLocal()
     try:
@@ -3,30 +3,50 @@ from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.api.api_v1.api import api_router
-from app.db.session import engine
-from app.models.database import Base
-from fastapi.staticfiles import StaticFiles
+from app.api.api_v1.endpoints.search import ensure_search_indexes
+from app.db.session import engine, warm_pool
+from app.models.database import Base, ensure_columns
+from app.services.audio_service import audio_service
+from app.services.cv_service import cv_service
+from app.api.http_cache import CachedStaticFiles, SelectiveGZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+# orjson encodes the large timeline/search payloads several times faster than stdlib json
+try:
+    import orjson  # noqa: F401
+    DefaultResponse = ORJSONResponse
+except ImportError:
+    DefaultResponse = JSONResponse
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    default_response_class=DefaultResponse
 )
 
 # Explicit CORS - Permissive for development
+# The single CORS layer; Starlette answers preflight OPTIONS itself at the ASGI level.
+# Without credentials a wildcard is sent as-is instead of echoing Origin (and Vary: Origin) per request.
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Allow all origins in development
-    allow_credentials=True,
+    allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
     expose_headers=["*"],
 )
 
+# Compress JSON payloads; media is already compressed and NDJSON must stream unbuffered
+app.add_middleware(
+    SelectiveGZipMiddleware,
+    minimum_size=1024,
+    exclude_prefixes=("/media_files", f"{settings.API_V1_STR}/ai-monitor/analyze-stream"),
+)
+
 # Mount media storage
-if not os.path.exists(settings.STORAGE_PATH):
-    os.makedirs(settings.STORAGE_PATH, exist_ok=True)
-app.mount("/media_files", StaticFiles(directory=settings.STORAGE_PATH), name="media_files")
+os.makedirs(settings.STORAGE_PATH, exist_ok=True)
+app.mount("/media_files", CachedStaticFiles(directory=settings.STORAGE_PATH), name="media_files")
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -41,10 +61,24 @@ async def health_check():
 @app.on_event("startup")
 def startup_event():
     """Create all database tables on startup and log config"""
-    Base.metadata.create_all(bind=engine)
-    print("✅ Database tables created successfully!")
-    print("✅ Database tables created successfully!")
-    print(f"🚀 CORS Policy: Explicit Origins (Credentials Enabled)")
+    # Schema reflection costs a round of catalog queries; do it once per process
+    if not getattr(app.state, "db_ready", False):
+        Base.metadata.create_all(bind=engine)
+        ensure_columns(engine)
+        try:
+            ensure_search_indexes(engine)
+        except Exception as e:
+            print(f"⚠️ Search indexes not created: {e}")
+        app.state.db_ready = True
+        print("✅ Database tables created successfully!")
+        try:
+            print(f"🔌 Warmed {warm_pool(engine)} pooled DB connections")
+        except Exception as e:
+            print(f"⚠️ DB pool warmup failed: {e}")
+    if settings.PRELOAD_MODELS:
+        audio_service.start_warmup()
+        cv_service.start_preload()
+    print(f"🚀 CORS Policy: Wildcard Origins (Credentials Disabled)")
     print(f"🌐 Allowed Origins: {[str(origin) for origin in settings.BACKEND_CORS_ORIGINS]}")
     print(f"📡 API Path Prefix: {settings.API_V1_STR}")
     print(f"🛠️ Debug Mode: {settings.DEBUG}")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, JSON, DateTime, Enum
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, JSON, DateTime, Enum, inspect, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 import datetime
@@ -39,6 +39,13 @@ class Take(Base):
     file_name = Column(String)
     file_size = Column(Integer)
     duration = Column(Float) # in seconds
+
+    # Container metadata, probed once at upload (see media_probe)
+    fps = Column(Float, nullable=True)
+    frame_count = Column(Integer, nullable=True)
+    width = Column(Integer, nullable=True)
+    height = Column(Integer, nullable=True)
+    codec = Column(String, nullable=True)
     
     # AI Data
     confidence_score = Column(Float, default=0.0)
@@ -90,3 +97,25 @@ class SearchFeedback(Base):
     is_relevant = Column(String)  # "yes", "no"
     editor_notes = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
+
+
+def ensure_columns(bind):
+    """
+    create_all() never alters existing tables, so add any nullable columns
+    that older databases are missing.
+    """
+    inspector = inspect(bind)
+    for model in (Take, MomentEmbedding):
+        table = model.__table__
+        existing = {c["name"] for c in inspector.get_columns(table.name)}
+        missing = [c for c in table.columns if c.name not in existing and c.nullable]
+        if not missing:
+            continue
+        with bind.begin() as conn:
+            for column in missing:
+                col_type = column.type.compile(dialect=bind.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}"))
+            # create_all() skipped the table, so it skipped the new columns' indexes too
+            for index in table.indexes:
+                if any(c in missing for c in index.columns):
+                    index.create(conn, checkfirst=True)
@@ -26,7 +26,7 @@ class DataIngestionService:
             # Clear existing index? Optional.
             # semantic_search_service.clear_index()
             
-            count = 0
+            moments = []
             for item in data:
                 # Map JSON fields to Index Schema
                 # clip_id, start, end, embedding, description
@@ -39,17 +39,19 @@ class DataIngestionService:
                 import numpy as np
                 embedding = np.array(item["embedding"])
                 
-                semantic_search_service.index_moment(
+                moments.append(dict(
                     moment_id=moment_id,
                     take_id=take_id,
                     start_time=item["start_time"],
                     end_time=item["end_time"],
                     embedding=embedding,
                     transcript_snippet=item["transcript"],
-                    emotion_label=item.get("emotion_label", "neutral"),
-                    reasoning={"description": item["description"]}
-                )
-                count += 1
+                    emotion_label=item.get("emotion_label", "neutral")
+                ))
+            
+            # One transaction for the whole export instead of one per moment
+            semantic_search_service.index_moments(moments)
+            count = len(moments)
                 
             semantic_search_service.save_index()
             logger.info(f"Successfully ingested {count} moments.")
@@ -0,0 +1,160 @@
+"""
+Frame Reader
+Yields sampled BGR frames for detection. Prefers decord (batched random
+access decode in C) and PyAV (threaded ffmpeg decode), falling back to
+OpenCV grab/retrieve when neither is installed.
+"""
+import logging
+from typing import Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Frames decoded per decord call; bounds memory for long 4K sources
+DECORD_CHUNK = 16
+
+# Beyond this many frames to the next sample, OpenCV seeks instead of grabbing forward
+SEEK_GAP = 120
+
+
+def iter_sampled_frames(video_path: str, indices: List[int],
+                        max_side: Optional[int] = None) -> Iterator[Tuple[int, "object"]]:
+    """
+    Yield (frame_index, bgr_ndarray) for each readable index, in order.
+    With max_side, frames are downscaled so their longest edge fits it.
+    """
+    if not indices:
+        return iter(())
+    for reader in (_iter_decord, _iter_pyav):
+        frames = reader(video_path, indices, max_side)
+        if frames is not None:
+            return frames
+    return _iter_opencv(video_path, indices, max_side)
+
+
+def _fit_size(width: int, height: int, max_side: Optional[int]) -> Optional[Tuple[int, int]]:
+    """Target (width, height) with the longest edge at max_side, or None if no downscale is needed."""
+    if not max_side or max(width, height) <= max_side:
+        return None
+    scale = max_side / max(width, height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def _shrink(frame, max_side: Optional[int]):
+    size = _fit_size(frame.shape[1], frame.shape[0], max_side)
+    if size is None:
+        return frame
+    import cv2
+    return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+
+def _iter_decord(video_path: str, indices: List[int], max_side: Optional[int] = None):
+    try:
+        from decord import VideoReader, cpu
+        vr = VideoReader(video_path, ctx=cpu(0))
+    except Exception:
+        return None
+
+    def _gen():
+        valid = [i for i in indices if i < len(vr)]
+        for start in range(0, len(valid), DECORD_CHUNK):
+            chunk = valid[start:start + DECORD_CHUNK]
+            batch = vr.get_batch(chunk).asnumpy()
+            for idx, rgb in zip(chunk, batch):
+                # YOLO expects BGR like cv2.imread
+                yield idx, _shrink(rgb[..., ::-1].copy(), max_side)
+    return _gen()
+
+
+def _iter_pyav(video_path: str, indices: List[int], max_side: Optional[int] = None):
+    try:
+        import av
+        container = av.open(video_path)
+    except Exception:
+        return None
+    if not container.streams.video:
+        container.close()
+        return None
+
+    def _gen():
+        stream = container.streams.video[0]
+        stream.thread_type = "AUTO"  # ffmpeg frame threading
+        # swscale resizes during the colour conversion, no second pass needed
+        size = _fit_size(stream.codec_context.width, stream.codec_context.height, max_side)
+        reformat = {"width": size[0], "height": size[1]} if size else {}
+        try:
+            if stream.average_rate and stream.time_base:
+                frames = _pyav_seeking(container, stream, indices, float(stream.average_rate))
+            else:
+                frames = _pyav_sequential(container, stream, indices)
+            for frame_idx, frame in frames:
+                yield frame_idx, frame.to_ndarray(format="bgr24", **reformat)
+        finally:
+            container.close()
+    return _gen()
+
+
+def _pyav_sequential(container, stream, indices: List[int]):
+    """Decode from the start, keeping the wanted frames (no frame rate to seek by)."""
+    wanted = set(indices)
+    last = max(indices)
+    for frame_idx, frame in enumerate(container.decode(stream)):
+        if frame_idx in wanted:
+            yield frame_idx, frame
+        if frame_idx >= last:
+            break
+
+
+def _pyav_seeking(container, stream, indices: List[int], fps: float):
+    """
+    Decode forward between nearby targets; for a target more than SEEK_GAP
+    frames ahead, seek to the keyframe before it instead. Frame positions
+    come from pts, so each target gets the first frame at or after it.
+    """
+    time_base = stream.time_base
+    start = stream.start_time or 0
+    decoder = None
+    pos = 0  # Index of the next frame the decoder will produce
+    for target in sorted(set(indices)):
+        if decoder is None or target - pos > SEEK_GAP:
+            container.seek(start + int(target / fps / time_base), stream=stream, backward=True)
+            decoder = container.decode(stream)
+        for frame in decoder:
+            frame_idx = round(float((frame.pts - start) * time_base) * fps) if frame.pts is not None else pos
+            pos = frame_idx + 1
+            if frame_idx >= target:
+                yield target, frame
+                break
+        else:
+            return
+
+
+def _iter_opencv(video_path: str, indices: List[int], max_side: Optional[int] = None):
+    import cv2
+
+    cap = cv2.VideoCapture(video_path)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Frames are pulled on demand; no read-ahead queue
+    try:
+        scratch = None  # Full-size decode target, reused while downscaled copies are yielded
+        pos = 0  # Index of the next frame grab() will decode
+        for frame_idx in sorted(indices):
+            if frame_idx < pos or frame_idx - pos > SEEK_GAP:
+                # Far ahead (or behind): a keyframe seek beats decoding every frame in between
+                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+                pos = frame_idx
+            # grab() decodes without the YUV->BGR conversion; only the target is retrieved
+            while pos < frame_idx:
+                if not cap.grab():
+                    return
+                pos += 1
+            if not cap.grab():
+                return
+            pos += 1
+            ret, frame = cap.retrieve(scratch) if scratch is not None else cap.retrieve()
+            if ret:
+                small = _shrink(frame, max_side)
+                if small is not frame:
+                    # Consumers only see the resized copy, so the next retrieve can overwrite this one
+                    scratch = frame
+                yield frame_idx, small
+    finally:
+        cap.release()
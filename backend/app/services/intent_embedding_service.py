@@ -2,16 +2,190 @@
 Intent Embedding Service for SmartCut AI
 Generates multimodal intent vectors from video moments for semantic search.
 """
+import hashlib
+import os
 import numpy as np
 import logging
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Set, Tuple, Union
 import json
 
 logger = logging.getLogger(__name__)
 
+SENTENCE_MODEL_ID = "sentence-transformers/all-MiniLM-L6-v2"
+SENTENCE_MAX_TOKENS = 256  # all-MiniLM-L6-v2's max_seq_length
+
+_sentence_model = None
+
+
+def _seeded_rng(data: bytes) -> np.random.Generator:
+    """Generator seeded from a 64-bit blake2b digest, so mock vectors match across processes (unlike salted hash())."""
+    return np.random.default_rng(int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little"))
+
+
+class OnnxSentenceEncoder:
+    """
+    all-MiniLM-L6-v2 served from an ONNX Runtime session. Mirrors
+    SentenceTransformer.encode (mean pooling over the attention mask, optional
+    L2 normalisation) so callers don't care which backend loaded.
+    """
+
+    def __init__(self, session, tokenizer):
+        self.session = session
+        self.tokenizer = tokenizer
+
+    def encode(self, sentences: Union[str, List[str]], batch_size: int = 32,
+               normalize_embeddings: bool = False) -> np.ndarray:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        chunks = [self._encode_batch(texts[i:i + batch_size]) for i in range(0, len(texts), batch_size)]
+        embeddings = np.concatenate(chunks) if chunks else np.empty((0, IntentEmbeddingService.EMBEDDING_DIM), np.float32)
+        if normalize_embeddings:
+            embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+        return embeddings[0] if single else embeddings
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        # Padding only to the longest text in this batch
+        inputs = self.tokenizer(
+            texts, padding=True, truncation=True, max_length=SENTENCE_MAX_TOKENS, return_tensors="np"
+        )
+        hidden = np.asarray(self.session(**inputs).last_hidden_state, dtype=np.float32)
+        mask = inputs["attention_mask"][..., None].astype(np.float32)
+        return (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+
+
+def _load_onnx_encoder() -> OnnxSentenceEncoder:
+    """
+    Export the model to ONNX on first use and reuse the export from storage
+    afterwards. On CPU with EMBEDDING_INT8, a dynamically quantized copy is
+    written next to it once and served instead.
+    """
+    from optimum.onnxruntime import ORTModelForFeatureExtraction
+    from transformers import AutoTokenizer
+    from app.core.config import settings
+
+    export_dir = os.path.join(settings.STORAGE_PATH, "models", "all-MiniLM-L6-v2-onnx")
+    providers = ["CPUExecutionProvider"]
+    try:
+        import onnxruntime
+        if "CUDAExecutionProvider" in onnxruntime.get_available_providers():
+            providers.insert(0, "CUDAExecutionProvider")
+    except ImportError:
+        pass
+
+    if os.path.exists(os.path.join(export_dir, "model.onnx")):
+        session = ORTModelForFeatureExtraction.from_pretrained(export_dir, provider=providers[0])
+        tokenizer = AutoTokenizer.from_pretrained(export_dir)
+    else:
+        session = ORTModelForFeatureExtraction.from_pretrained(SENTENCE_MODEL_ID, export=True, provider=providers[0])
+        tokenizer = AutoTokenizer.from_pretrained(SENTENCE_MODEL_ID)
+        os.makedirs(export_dir, exist_ok=True)
+        session.save_pretrained(export_dir)
+        tokenizer.save_pretrained(export_dir)
+
+    if settings.EMBEDDING_INT8 and providers[0] == "CPUExecutionProvider":
+        try:
+            if not os.path.exists(os.path.join(export_dir, "model_quantized.onnx")):
+                from optimum.onnxruntime import ORTQuantizer
+                from optimum.onnxruntime.configuration import AutoQuantizationConfig
+                qconfig = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+                ORTQuantizer.from_pretrained(export_dir).quantize(save_dir=export_dir, quantization_config=qconfig)
+            session = ORTModelForFeatureExtraction.from_pretrained(
+                export_dir, file_name="model_quantized.onnx", provider=providers[0]
+            )
+        except Exception as e:
+            logger.warning(f"INT8 ONNX quantization failed ({e}), serving the fp32 export")
+    return OnnxSentenceEncoder(session, tokenizer)
+
+
+def _quantize_sentence_transformer(model):
+    """Swap the transformer's nn.Linear layers for dynamic qint8 ones (CPU only)."""
+    import torch
+    if torch.cuda.is_available():
+        return model
+    transformer = model._first_module()
+    transformer.auto_model = torch.quantization.quantize_dynamic(
+        transformer.auto_model, {torch.nn.Linear}, dtype=torch.qint8
+    )
+    # First call sets up the quantized kernels; keep it off the request path
+    model.encode("warmup")
+    logger.info("Quantized all-MiniLM-L6-v2 linear layers to INT8")
+    return model
+
+
+# Query vocabulary for parse_query_intent, matched as substrings of the lowercased query
+_QUERY_EMOTION_KEYWORDS = {
+    "joy": ["joy", "happy", "joyful", "elated", "pleased", "smiling", "laughing", "laughter"],
+    "sadness": ["sad", "sadness", "depressed", "melancholy", "tearful", "crying", "grief"],
+    "anger": ["angry", "anger", "furious", "irritated", "frustrated", "rage", "confrontation"],
+    "fear": ["fearful", "fear", "afraid", "scared", "terrified", "panic", "anxious"],
+    "disgust": ["disgust", "disgusted", "revolted", "gross", "loathing"],
+    "surprise": ["surprised", "surprise", "shocked", "startled", "amazed"],
+    "analytical": ["analytical", "logic", "calculated", "technical", "screen recording"],
+    "thoughtful": ["thoughtful", "pensive", "contemplating", "considering", "listening"],
+    "tense": ["tense", "tension", "strained", "stressed", "uncomfortable"],
+    "relieved": ["relieved", "relief", "relaxed", "safe"],
+    "awkward": ["awkward", "uncomfortable", "nervous", "hesitant"],
+    "confident": ["confident", "assured", "bold", "strong"]
+}
+
+_QUERY_TEMPORAL_KEYWORDS = {
+    "before": ["before", "prior to", "leading up to"],
+    "after": ["after", "following", "post"],
+    "during": ["during", "while", "mid-"],
+    "pause": ["pause", "silence", "quiet", "still"]
+}
+
+_QUERY_KEYWORD_GROUPS = {"emotions": _QUERY_EMOTION_KEYWORDS, "temporal_cues": _QUERY_TEMPORAL_KEYWORDS}
+
+
+@lru_cache(maxsize=1)
+def _intent_automaton():
+    """
+    Aho-Corasick automaton over every query keyword, built on first use.
+    Returns None when pyahocorasick is not installed.
+    """
+    try:
+        import ahocorasick
+    except ImportError:
+        return None
+
+    owners = {}
+    for group, categories in _QUERY_KEYWORD_GROUPS.items():
+        for category, keywords in categories.items():
+            for kw in keywords:
+                owners.setdefault(kw, []).append((group, category))
+    automaton = ahocorasick.Automaton()
+    for kw, labels in owners.items():
+        automaton.add_word(kw, tuple(labels))
+    automaton.make_automaton()
+    return automaton
+
+
+def _intent_hits(query_lower: str) -> Set[Tuple[str, str]]:
+    """(group, category) pairs with at least one keyword in the query, in one pass."""
+    automaton = _intent_automaton()
+    if automaton is None:
+        return {
+            (group, category)
+            for group, categories in _QUERY_KEYWORD_GROUPS.items()
+            for category, keywords in categories.items()
+            if any(kw in query_lower for kw in keywords)
+        }
+    return {label for _, labels in automaton.iter(query_lower) for label in labels}
+
+
 # Defer import to method
 def get_sentence_model():
     global _sentence_model
+    if _sentence_model is None:
+        from app.core.config import settings
+        if settings.EMBEDDING_ONNX:
+            try:
+                _sentence_model = _load_onnx_encoder()
+                logger.info("Loaded all-MiniLM-L6-v2 on ONNX Runtime")
+            except Exception as e:
+                logger.info(f"ONNX Runtime encoder unavailable ({e}), using sentence-transformers")
     if _sentence_model is None:
         try:
             from sentence_transformers import SentenceTransformer
@@ -20,6 +194,13 @@ def get_sentence_model():
         except Exception as e:
             logger.warning(f"Failed to load sentence-transformers: {e}. Using mock embeddings.")
             _sentence_model = "mock"
+        else:
+            from app.core.config import settings
+            if settings.EMBEDDING_INT8:
+                try:
+                    _sentence_model = _quantize_sentence_transformer(_sentence_model)
+                except Exception as e:
+                    logger.warning(f"INT8 quantization skipped: {e}")
     return _sentence_model
 
 
@@ -63,22 +244,48 @@ class IntentEmbeddingService:
         """
         Generate a unified intent embedding for a video moment.
         """
-        model = self._get_model()
-        
         # Build descriptive text combining all modalities
         intent_description = self._build_intent_description(
             transcript_snippet, emotion_data, audio_features, timing_data, script_context
         )
-        
-        # Generate embedding
+        return self._encode_one(intent_description)
+    
+    def generate_moment_embeddings_batch(self, moments: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Embed many moments in one encoder call. Each item takes the keyword
+        arguments of generate_moment_embedding; returns an (N, EMBEDDING_DIM) array.
+        """
+        descriptions = [
+            self._build_intent_description(
+                m.get("transcript_snippet", ""), m.get("emotion_data"), m.get("audio_features"),
+                m.get("timing_data"), m.get("script_context", "")
+            )
+            for m in moments
+        ]
+        return self._encode(descriptions)
+    
+    def _encode_one(self, text: str) -> np.ndarray:
+        """Embedding for a single text; repeated texts (common searches, retries) skip the encoder."""
+        # Fresh writable array per call; the cached bytes are never handed out
+        return np.frombuffer(self._encode_cached(text), dtype=np.float32).copy()
+    
+    @lru_cache(maxsize=1024)
+    def _encode_cached(self, text: str) -> bytes:
+        return self._encode([text])[0].tobytes()
+    
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """L2-normalised float32 embeddings, one row per text."""
+        model = self._get_model()
+        if not texts:
+            return np.empty((0, self.EMBEDDING_DIM), dtype=np.float32)
         if model == "mock":
-            np.random.seed(hash(intent_description) % 2**32)
-            embedding = np.random.randn(self.EMBEDDING_DIM).astype(np.float32)
-            embedding = embedding / np.linalg.norm(embedding)
+            embeddings = np.stack([
+                _seeded_rng(text.encode()).standard_normal(self.EMBEDDING_DIM, dtype=np.float32) for text in texts
+            ])
+            embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
         else:
-            embedding = model.encode(intent_description, normalize_embeddings=True)
-        
-        return embedding.astype(np.float32)
+            embeddings = model.encode(texts, batch_size=32, normalize_embeddings=True)
+        return np.asarray(embeddings, dtype=np.float32)
     
     def _build_intent_description(
         self,
@@ -120,53 +327,22 @@ class IntentEmbeddingService:
         """
         Parse an editor's search query to extract intent components.
         """
-        query_lower = query.lower()
+        hits = _intent_hits(query.lower())
         
         intent = {
             "raw_query": query,
-            "emotions": [],
-            "temporal_cues": [],
+            "emotions": [e for e in _QUERY_EMOTION_KEYWORDS if ("emotions", e) in hits],
+            "temporal_cues": [t for t in _QUERY_TEMPORAL_KEYWORDS if ("temporal_cues", t) in hits],
             "actions": [],
             "narrative_hints": []
         }
         
-        emotion_keywords = {
-            "joy": ["joy", "happy", "joyful", "elated", "pleased", "smiling", "laughing", "laughter"],
-            "sadness": ["sad", "sadness", "depressed", "melancholy", "tearful", "crying", "grief"],
-            "anger": ["angry", "anger", "furious", "irritated", "frustrated", "rage", "confrontation"],
-            "fear": ["fearful", "fear", "afraid", "scared", "terrified", "panic", "anxious"],
-            "disgust": ["disgust", "disgusted", "revolted", "gross", "loathing"],
-            "surprise": ["surprised", "surprise", "shocked", "startled", "amazed"],
-            "analytical": ["analytical", "logic", "calculated", "technical", "screen recording"],
-            "thoughtful": ["thoughtful", "pensive", "contemplating", "considering", "listening"],
-            "tense": ["tense", "tension", "strained", "stressed", "uncomfortable"],
-            "relieved": ["relieved", "relief", "relaxed", "safe"],
-            "awkward": ["awkward", "uncomfortable", "nervous", "hesitant"],
-            "confident": ["confident", "assured", "bold", "strong"]
-        }
-        
-        for emotion, keywords in emotion_keywords.items():
-            if any(kw in query_lower for kw in keywords):
-                intent["emotions"].append(emotion)
-        
-        temporal_keywords = {
-            "before": ["before", "prior to", "leading up to"],
-            "after": ["after", "following", "post"],
-            "during": ["during", "while", "mid-"],
-            "pause": ["pause", "silence", "quiet", "still"]
-        }
-        
-        for temporal, keywords in temporal_keywords.items():
-            if any(kw in query_lower for kw in keywords):
-                intent["temporal_cues"].append(temporal)
-        
         return intent
     
     def embed_query(self, query: str) -> np.ndarray:
         """
         Generate embedding for a search query with enhanced intent context.
         """
-        model = self._get_model()
         intent = self.parse_query_intent(query)
         
         enhanced_query = query
@@ -175,14 +351,7 @@ class IntentEmbeddingService:
         if intent["temporal_cues"]:
             enhanced_query += f". Timing: {', '.join(intent['temporal_cues'])}"
         
-        if model == "mock":
-            np.random.seed(hash(enhanced_query) % 2**32)
-            embedding = np.random.randn(self.EMBEDDING_DIM).astype(np.float32)
-            embedding = embedding / np.linalg.norm(embedding)
-        else:
-            embedding = model.encode(enhanced_query, normalize_embeddings=True)
-        
-        return embedding.astype(np.float32)
+        return self._encode_one(enhanced_query)
 
 # Singleton instance
 intent_embedding_service = IntentEmbeddingService()
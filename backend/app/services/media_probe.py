@@ -0,0 +1,140 @@
+"""
+Media Probe
+Reads technical video metadata (fps, resolution, codec, duration) from the
+container header via PyAV or ffprobe, falling back to OpenCV.
+Results are immutable for a given file, so they are cached in-process and
+persisted on the Take row at upload time.
+"""
+import os
+import logging
+from functools import lru_cache
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Take columns populated from a probe
+PROBE_FIELDS = ("fps", "frame_count", "width", "height", "codec")
+
+
+def probe_video(video_path: str) -> Optional[dict]:
+    """
+    Probe a video file. Returns None if the file is missing or unreadable.
+    Keyed on (path, mtime, size) so a replaced file is probed again.
+    """
+    try:
+        stats = os.stat(video_path)
+    except OSError:
+        return None
+    result = _probe_cached(video_path, stats.st_mtime, stats.st_size)
+    return dict(result) if result else None
+
+
+@lru_cache(maxsize=1024)
+def _probe_cached(video_path: str, mtime: float, size: int) -> Optional[dict]:
+    # Header-only probes first; OpenCV initialises the decoder and may walk the index
+    for probe in (_probe_pyav, _probe_ffprobe, _probe_opencv):
+        try:
+            result = probe(video_path)
+        except Exception as e:
+            logger.debug(f"{probe.__name__} failed for {video_path}: {e}")
+            continue
+        if result is not None:
+            return result
+    return None
+
+
+def _probe_pyav(video_path: str) -> Optional[dict]:
+    try:
+        import av
+    except ImportError:
+        return None
+
+    with av.open(video_path) as container:
+        if not container.streams.video:
+            return None
+        stream = container.streams.video[0]
+        fps = round(float(stream.average_rate), 2) if stream.average_rate else 0.0
+        if stream.duration is not None and stream.time_base is not None:
+            duration = float(stream.duration * stream.time_base)
+        elif container.duration is not None:
+            duration = container.duration / av.time_base
+        else:
+            duration = 0.0
+        frame_count = stream.frames or int(duration * fps)
+        return {
+            "fps": fps,
+            "frame_count": frame_count,
+            "width": stream.codec_context.width,
+            "height": stream.codec_context.height,
+            "duration": round(duration, 2),
+            "codec": stream.codec_context.name,
+        }
+
+
+def _probe_ffprobe(video_path: str) -> Optional[dict]:
+    import json
+    import shutil
+    import subprocess
+
+    if not shutil.which("ffprobe"):
+        return None
+
+    proc = subprocess.run(
+        ["ffprobe", "-v", "error", "-select_streams", "v:0",
+         "-show_streams", "-show_format", "-of", "json", video_path],
+        capture_output=True, text=True, timeout=30
+    )
+    if proc.returncode != 0:
+        return None
+    info = json.loads(proc.stdout)
+    streams = info.get("streams") or []
+    if not streams:
+        return None
+    stream = streams[0]
+
+    num, _, den = stream.get("avg_frame_rate", "0/1").partition("/")
+    fps = round(float(num) / float(den), 2) if den and float(den) else 0.0
+    duration = float(stream.get("duration") or info.get("format", {}).get("duration") or 0)
+    frame_count = int(stream.get("nb_frames") or duration * fps)
+    return {
+        "fps": fps,
+        "frame_count": frame_count,
+        "width": int(stream.get("width", 0)),
+        "height": int(stream.get("height", 0)),
+        "duration": round(duration, 2),
+        "codec": stream.get("codec_name", ""),
+    }
+
+
+def _probe_opencv(video_path: str) -> Optional[dict]:
+    try:
+        import cv2
+    except ImportError:
+        return None
+
+    cap = cv2.VideoCapture(video_path)
+    try:
+        if not cap.isOpened():
+            return None
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        fps = round(cap.get(cv2.CAP_PROP_FPS), 2)
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        fourcc = int(cap.get(cv2.CAP_PROP_FOURCC))
+        return {
+            "fps": fps,
+            "frame_count": frame_count,
+            "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            "duration": round(frame_count / fps, 2) if fps > 0 else 0,
+            "codec": "".join([chr((fourcc >> 8 * i) & 0xFF) for i in range(4)]).strip(),
+        }
+    finally:
+        cap.release()
+
+
+def apply_probe(take, probe: dict) -> None:
+    """Copy probe results onto a Take row."""
+    for field in PROBE_FIELDS:
+        setattr(take, field, probe.get(field))
+    if probe.get("duration"):
+        take.duration = probe["duration"]
@@ -0,0 +1,86 @@
+"""
+Micro-Batcher
+Coalesces single-item inference calls from concurrent requests into batched
+forward passes. A daemon worker drains a shared queue up to max_batch items
+or max_wait seconds, whichever comes first, and resolves each caller's future.
+With several workers (one per model replica), batches run concurrently.
+"""
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    def __init__(self, batch_fn: Callable[[List[Any]], List[Any]], max_batch: int = 8,
+                 max_wait: float = 0.02, name: str = "micro-batcher", workers: int = 1):
+        self._batch_fn = batch_fn
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait
+        self.name = name
+        self.workers = max(1, workers)
+        self._queue = queue.Queue()
+        self._threads = None
+        self._lock = threading.Lock()
+
+    def submit(self, item: Any) -> Future:
+        """Queue one item; the returned future resolves to its batch output."""
+        future = Future()
+        self._ensure_worker()
+        self._queue.put((item, future))
+        return future
+
+    def submit_many(self, items: List[Any]) -> List[Future]:
+        """Queue several items back to back so they land in the same batch where possible."""
+        futures = [Future() for _ in items]
+        self._ensure_worker()
+        for item, future in zip(items, futures):
+            self._queue.put((item, future))
+        return futures
+
+    def _ensure_worker(self):
+        if self._threads is not None:
+            return
+        with self._lock:
+            if self._threads is None:
+                threads = [threading.Thread(target=self._run, name=f"{self.name}-{i}", daemon=True)
+                           for i in range(self.workers)]
+                for thread in threads:
+                    thread.start()
+                self._threads = threads
+
+    def _drain(self) -> list:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                # Past the deadline, still take whatever is already queued
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            # Callers that gave up cancel their futures; skip those items
+            batch = [(item, future) for item, future in self._drain() if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            items = [item for item, _ in batch]
+            try:
+                outputs = self._batch_fn(items)
+                if len(outputs) != len(batch):
+                    # zip() would leave the extra futures pending forever
+                    raise RuntimeError(f"batch_fn returned {len(outputs)} outputs for {len(batch)} items")
+                for (_, future), output in zip(batch, outputs):
+                    future.set_result(output)
+            except Exception as e:
+                logger.warning(f"{self.name} batch of {len(batch)} failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
@@ -1,8 +1,159 @@
+import re
+from functools import lru_cache
 from typing import Dict, Any, List
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Comprehensive Emotion Keyword Map with weights
+_EMOTION_MAP_SPEC = {
+    "joy": {
+        "keywords": ["happy", "wonderful", "great", "excellent", "love", "excited", "wow", "amazing", 
+                   "good", "perfect", "laugh", "funny", "comedy", "smile", "celebrate", "party", 
+                   "cheer", "khush", "mazaa", "sundar", "badhiya", "magizhchi", "super", "brilliant", 
+                   "fantastic", "awesome", "beautiful", "blessed", "grateful", "delighted", "thrilled",
+                   "joyful", "cheerful", "pleased", "content", "haha", "lol", "rofl", "hilarious",
+                   "fun", "enjoy", "dance", "music", "play", "game", "birthday", "wedding"],
+        "filename_hints": ["happy", "joy", "funny", "comedy", "laugh", "celebration", "party", "fun",
+                          "birthday", "wedding", "dance", "music", "game", "play"],
+        "object_hints": ["cake", "balloon", "gift", "sports ball", "teddy bear", "frisbee"]
+    },
+    "sadness": {
+        "keywords": ["sad", "terrible", "bad", "unhappy", "cry", "regret", "lost", "broken", 
+                   "sorrow", "miss", "alone", "tear", "grief", "mourn", "depressed", "melancholy", 
+                   "dukh", "dard", "rona", "bekaar", "sogam", "varuththam", "painful", "hurt",
+                   "lonely", "heartbreak", "loss", "goodbye", "farewell", "sorry", "apologize",
+                   "unfortunate", "pity", "sympathy", "condolence", "funeral", "death", "die"],
+        "filename_hints": ["sad", "cry", "emotional", "tragic", "drama", "tears", "grief", 
+                          "goodbye", "farewell", "memory", "memorial"],
+        "object_hints": ["umbrella"]  # Rain/umbrella often associated with sadness
+    },
+    "anger": {
+        "keywords": ["angry", "mad", "hate", "furious", "stop", "never", "annoyed", "frustrated", 
+                   "yell", "aggressive", "rage", "fight", "conflict", "argue", "shout", "gussa", 
+                   "naraaz", "kobam", "damn", "hell", "upset", "irritated", "hostile", "violent",
+                   "attack", "punch", "hit", "destroy", "break", "smash", "explode", "war"],
+        "filename_hints": ["angry", "rage", "fight", "conflict", "tense", "intense", "action",
+                          "battle", "war", "attack", "destroy"],
+        "object_hints": ["knife", "sword", "gun", "rifle"]
+    },
+    "fear": {
+        "keywords": ["scared", "afraid", "danger", "help", "threat", "risk", "panic", "worry", 
+                   "fear", "dark", "compromised", "horror", "terror", "creepy", "haunted", 
+                   "darr", "ghabrahat", "payam", "achcham", "nervous", "anxious", "frightened",
+                   "terrified", "spooky", "nightmare", "scream", "run", "escape", "hide", "chase"],
+        "filename_hints": ["scary", "horror", "fear", "dark", "thriller", "suspense", "nervous",
+                          "creepy", "haunted", "nightmare", "terror"],
+        "object_hints": ["knife", "ghost"]
+    },
+    "disgust": {
+        "keywords": ["gross", "disgusting", "ew", "hate", "sick", "revolt", "nasty", "vile", 
+                   "appalling", "ghinauna", "yuck", "awful", "terrible", "horrible", "repulsive",
+                   "dirty", "filthy", "rotten", "stink", "smell", "ugly"],
+        "filename_hints": ["disgust", "gross", "weird", "strange", "ugly"],
+        "object_hints": []
+    },
+    "surprise": {
+        "keywords": ["whoa", "surprise", "sudden", "unexpected", "what", "shook", "flash", 
+                   "instant", "achanak", "hairaan", "shock", "omg", "wow", "really", "unbelievable",
+                   "incredible", "amazing", "astonish", "stun", "speechless", "gasp", "jaw", 
+                   "no way", "seriously", "are you kidding", "twist", "reveal"],
+        "filename_hints": ["surprise", "shock", "reveal", "twist", "unexpected", "prank", "reaction"],
+        "object_hints": ["gift", "box"]
+    },
+    "analytical": {
+        "keywords": ["monitor", "system", "data", "analysis", "technical", "calibrate", "status", 
+                   "report", "coordinate", "check", "verify", "screen", "code", "debug", "test", 
+                   "demo", "tutorial", "explain", "overview", "walkthrough", "step", "click",
+                   "install", "setup", "configure", "setting", "option", "menu", "button"],
+        "filename_hints": ["screen", "recording", "tutorial", "demo", "tech", "code", "debug", 
+                          "test", "capture", "howto", "guide", "review", "unbox", "setup"],
+        "object_hints": ["laptop", "keyboard", "mouse", "monitor", "tv", "cell phone", "remote"]
+    },
+    "thoughtful": {
+        "keywords": ["pensive", "contemplating", "considering", "listening", "hmm", "well", 
+                   "think", "thought", "sochna", "vichar", "idea", "shayad", "maybe", "perhaps", 
+                   "wonder", "curious", "interesting", "understand", "learn", "discuss", 
+                   "conversation", "talk", "interview", "question", "answer", "explain", "opinion"],
+        "filename_hints": ["interview", "talk", "discuss", "conversation", "think", "review",
+                          "podcast", "meeting", "chat", "vlog", "diary"],
+        "object_hints": ["book", "person"]
+    }
+}
+
+# Constant data: freeze it once at import instead of rebuilding it per call
+_EMOTION_MAP = {
+    emotion: {field: frozenset(values) for field, values in data.items()}
+    for emotion, data in _EMOTION_MAP_SPEC.items()
+}
+_EMOTIONS = tuple(_EMOTION_MAP)
+
+
+@lru_cache(maxsize=1)
+def _emotion_automata():
+    """
+    Aho-Corasick automata over every emotion keyword and every filename hint,
+    built on first use. Each pattern maps to (pattern, emotions listing it).
+    Returns None when pyahocorasick is not installed.
+    """
+    try:
+        import ahocorasick
+    except ImportError:
+        return None
+
+    automata = []
+    for field in ("keywords", "filename_hints"):
+        owners = {}
+        for emotion, data in _EMOTION_MAP.items():
+            for pattern in data[field]:
+                owners.setdefault(pattern, []).append(emotion)
+        automaton = ahocorasick.Automaton()
+        for pattern, emotions in owners.items():
+            automaton.add_word(pattern, (pattern, tuple(emotions)))
+        automaton.make_automaton()
+        automata.append(automaton)
+    return tuple(automata)
+
+
+@lru_cache(maxsize=1)
+def _emotion_patterns() -> Dict[str, "re.Pattern"]:
+    """Per-emotion keyword alternation, longest first, for the no-automaton fallback."""
+    return {
+        emotion: re.compile("|".join(map(re.escape, sorted(data["keywords"], key=len, reverse=True))))
+        for emotion, data in _EMOTION_MAP.items()
+    }
+
+
+def _keyword_counts(automaton, text: str) -> Dict[str, Any]:
+    """
+    pattern -> (non-overlapping occurrence count, emotions) in one pass over
+    text. Matches of a pattern arrive in position order, so skipping any that
+    overlap the previous counted one gives exactly str.count.
+    """
+    counts = {}
+    for end, (pattern, emotions) in automaton.iter(text):
+        seen = counts.get(pattern)
+        if seen is None:
+            counts[pattern] = [1, end, emotions]
+        elif end - len(pattern) >= seen[1]:
+            seen[0] += 1
+            seen[1] = end
+    return {pattern: (count, emotions) for pattern, (count, _, emotions) in counts.items()}
+
+
+def _lower(value: str) -> str:
+    """value.lower(), skipping the copy when it is already lowercase (e.g. ASR output)."""
+    if not value:
+        return ""
+    return value if value.islower() else value.lower()
+
+
+# align_script only needs tokens and Doc.similarity, which en_core_web_sm (no
+# static vectors) computes from the tok2vec tensor; the tagger, parser, lemmatizer
+# and NER passes over every token are never read
+_SPACY_DISABLED = ["tagger", "parser", "attribute_ruler", "lemmatizer", "ner"]
+
+
 # Heavy imports deferred to method scope
 class NLPService:
     def __init__(self):
@@ -15,14 +166,14 @@ class NLPService:
             try:
                 import spacy
                 logger.info("Initializing spaCy 'en_core_web_sm' (Lazy Load)...")
-                self._nlp = spacy.load("en_core_web_sm")
+                self._nlp = spacy.load("en_core_web_sm", disable=_SPACY_DISABLED)
                 logger.info("spaCy initialized successfully.")
             except Exception as e:
                 logger.warning(f"Failed to load spaCy model: {e}. Downloading on the fly...")
                 try:
                     import os
                     os.system("python -m spacy download en_core_web_sm")
-                    self._nlp = spacy.load("en_core_web_sm")
+                    self._nlp = spacy.load("en_core_web_sm", disable=_SPACY_DISABLED)
                 except:
                     logger.error("spaCy fallback failed. Using mock NLP.")
                     self._failed_to_load = True
@@ -50,15 +201,15 @@ class NLPService:
                 "confidence": 0.0
             }
 
-        doc_t = nlp(transcript.lower())
-        doc_s = nlp(script_text.lower())
+        # One pipe() call runs both texts through the pipeline as a single batch
+        doc_t, doc_s = nlp.pipe([transcript.lower(), script_text.lower()], batch_size=2)
 
         similarity = doc_t.similarity(doc_s)
 
         # Simple ad-lib detection (words in transcript NOT in script)
         # In a real app, this would be more sophisticated (fuzzy matching)
-        words_t = set([token.text for token in doc_t if not token.is_punct])
-        words_s = set([token.text for token in doc_s if not token.is_punct])
+        words_t = {token.text for token in doc_t if not token.is_punct}
+        words_s = frozenset(token.text for token in doc_s if not token.is_punct)
         
         ad_libs = list(words_t - words_s)
         
@@ -66,115 +217,79 @@ class NLPService:
         if len(ad_libs) > 0:
             reasoning += f" Detected potential ad-libs: {', '.join(ad_libs[:3])}..."
 
+        return {
+            "similarity": similarity,
+            "ad_libs": ad_libs,
+            "reasoning": reasoning,
+            "confidence": 0.9
+        }
+
     async def analyze_emotion(self, transcript: str, filename: str = "", video_description: str = "", detected_objects: list = None) -> Dict[str, Any]:
         """
         Analyzes the emotional tone using transcript, filename, video description, and detected objects.
         Returns multiple emotions for videos that match more than one category.
         """
-        text = (transcript or "").lower()
-        fname = (filename or "").lower()
-        desc = (video_description or "").lower()
-        objects = [o.lower() for o in (detected_objects or [])]
+        text = _lower(transcript)
+        fname = _lower(filename)
+        desc = _lower(video_description)
+        # Scoring only asks whether hints occur among the objects, so order and repeats don't matter
+        objects = tuple(sorted({o.lower() for o in (detected_objects or [])}))
         
+        result = self._score_emotions(text, fname, desc, objects)
+        # Callers get their own copy; the cached result must stay intact
+        return {
+            **result,
+            "scores": dict(result["scores"]),
+            "detected_emotions": [dict(d) for d in result["detected_emotions"]]
+        }
+    
+    @lru_cache(maxsize=1024)
+    def _score_emotions(self, text: str, fname: str, desc: str, objects: tuple) -> Dict[str, Any]:
+        """Scoring core of analyze_emotion; pure in its lowercased inputs, so repeats are cached."""
         # Combined text for analysis
-        all_text = f"{text} {desc}"
+        # (no keyword ends in a space, so a description-less text needs no copy)
+        all_text = f"{text} {desc}" if desc else text
         
-        # Comprehensive Emotion Keyword Map with weights
-        emotion_map = {
-            "joy": {
-                "keywords": ["happy", "wonderful", "great", "excellent", "love", "excited", "wow", "amazing", 
-                           "good", "perfect", "laugh", "funny", "comedy", "smile", "celebrate", "party", 
-                           "cheer", "khush", "mazaa", "sundar", "badhiya", "magizhchi", "super", "brilliant", 
-                           "fantastic", "awesome", "beautiful", "blessed", "grateful", "delighted", "thrilled",
-                           "joyful", "cheerful", "pleased", "content", "haha", "lol", "rofl", "hilarious",
-                           "fun", "enjoy", "dance", "music", "play", "game", "birthday", "wedding"],
-                "filename_hints": ["happy", "joy", "funny", "comedy", "laugh", "celebration", "party", "fun",
-                                  "birthday", "wedding", "dance", "music", "game", "play"],
-                "object_hints": ["cake", "balloon", "gift", "sports ball", "teddy bear", "frisbee"]
-            },
-            "sadness": {
-                "keywords": ["sad", "terrible", "bad", "unhappy", "cry", "regret", "lost", "broken", 
-                           "sorrow", "miss", "alone", "tear", "grief", "mourn", "depressed", "melancholy", 
-                           "dukh", "dard", "rona", "bekaar", "sogam", "varuththam", "painful", "hurt",
-                           "lonely", "heartbreak", "loss", "goodbye", "farewell", "sorry", "apologize",
-                           "unfortunate", "pity", "sympathy", "condolence", "funeral", "death", "die"],
-                "filename_hints": ["sad", "cry", "emotional", "tragic", "drama", "tears", "grief", 
-                                  "goodbye", "farewell", "memory", "memorial"],
-                "object_hints": ["umbrella"]  # Rain/umbrella often associated with sadness
-            },
-            "anger": {
-                "keywords": ["angry", "mad", "hate", "furious", "stop", "never", "annoyed", "frustrated", 
-                           "yell", "aggressive", "rage", "fight", "conflict", "argue", "shout", "gussa", 
-                           "naraaz", "kobam", "damn", "hell", "upset", "irritated", "hostile", "violent",
-                           "attack", "punch", "hit", "destroy", "break", "smash", "explode", "war"],
-                "filename_hints": ["angry", "rage", "fight", "conflict", "tense", "intense", "action",
-                                  "battle", "war", "attack", "destroy"],
-                "object_hints": ["knife", "sword", "gun", "rifle"]
-            },
-            "fear": {
-                "keywords": ["scared", "afraid", "danger", "help", "threat", "risk", "panic", "worry", 
-                           "fear", "dark", "compromised", "horror", "terror", "creepy", "haunted", 
-                           "darr", "ghabrahat", "payam", "achcham", "nervous", "anxious", "frightened",
-                           "terrified", "spooky", "nightmare", "scream", "run", "escape", "hide", "chase"],
-                "filename_hints": ["scary", "horror", "fear", "dark", "thriller", "suspense", "nervous",
-                                  "creepy", "haunted", "nightmare", "terror"],
-                "object_hints": ["knife", "ghost"]
-            },
-            "disgust": {
-                "keywords": ["gross", "disgusting", "ew", "hate", "sick", "revolt", "nasty", "vile", 
-                           "appalling", "ghinauna", "yuck", "awful", "terrible", "horrible", "repulsive",
-                           "dirty", "filthy", "rotten", "stink", "smell", "ugly"],
-                "filename_hints": ["disgust", "gross", "weird", "strange", "ugly"],
-                "object_hints": []
-            },
-            "surprise": {
-                "keywords": ["whoa", "surprise", "sudden", "unexpected", "what", "shook", "flash", 
-                           "instant", "achanak", "hairaan", "shock", "omg", "wow", "really", "unbelievable",
-                           "incredible", "amazing", "astonish", "stun", "speechless", "gasp", "jaw", 
-                           "no way", "seriously", "are you kidding", "twist", "reveal"],
-                "filename_hints": ["surprise", "shock", "reveal", "twist", "unexpected", "prank", "reaction"],
-                "object_hints": ["gift", "box"]
-            },
-            "analytical": {
-                "keywords": ["monitor", "system", "data", "analysis", "technical", "calibrate", "status", 
-                           "report", "coordinate", "check", "verify", "screen", "code", "debug", "test", 
-                           "demo", "tutorial", "explain", "overview", "walkthrough", "step", "click",
-                           "install", "setup", "configure", "setting", "option", "menu", "button"],
-                "filename_hints": ["screen", "recording", "tutorial", "demo", "tech", "code", "debug", 
-                                  "test", "capture", "howto", "guide", "review", "unbox", "setup"],
-                "object_hints": ["laptop", "keyboard", "mouse", "monitor", "tv", "cell phone", "remote"]
-            },
-            "thoughtful": {
-                "keywords": ["pensive", "contemplating", "considering", "listening", "hmm", "well", 
-                           "think", "thought", "sochna", "vichar", "idea", "shayad", "maybe", "perhaps", 
-                           "wonder", "curious", "interesting", "understand", "learn", "discuss", 
-                           "conversation", "talk", "interview", "question", "answer", "explain", "opinion"],
-                "filename_hints": ["interview", "talk", "discuss", "conversation", "think", "review",
-                                  "podcast", "meeting", "chat", "vlog", "diary"],
-                "object_hints": ["book", "person"]
-            }
-        }
-
-        scores = {emotion: 0.0 for emotion in emotion_map.keys()}
+        scores = dict.fromkeys(_EMOTIONS, 0.0)
         
-        # 1. Keyword-based scoring from transcript and description (weighted by frequency)
-        for emotion, data in emotion_map.items():
-            for kw in data["keywords"]:
-                count = all_text.count(kw)
-                if count > 0:
+        automata = _emotion_automata()
+        if automata is not None:
+            keyword_automaton, filename_automaton = automata
+            # 1. Keyword-based scoring from transcript and description (weighted by frequency)
+            for count, emotions in _keyword_counts(keyword_automaton, all_text).values():
+                for emotion in emotions:
                     scores[emotion] += min(count * 0.5, 3.0)  # Cap at 3 per keyword
-        
-        # 2. Filename-based scoring (IMPORTANT for fallback scenarios)
-        for emotion, data in emotion_map.items():
-            for hint in data.get("filename_hints", []):
-                if hint in fname:
+            
+            # 2. Filename-based scoring (IMPORTANT for fallback scenarios)
+            for _, emotions in _keyword_counts(filename_automaton, fname).values():
+                for emotion in emotions:
                     scores[emotion] += 2.5  # Filename hints weighted higher
+        else:
+            # 1. Keyword-based scoring from transcript and description (weighted by frequency)
+            patterns = _emotion_patterns()
+            for emotion, data in _EMOTION_MAP.items():
+                # One regex scan rules out emotions with no keyword present at all
+                if not patterns[emotion].search(all_text):
+                    continue
+                for kw in data["keywords"]:
+                    count = all_text.count(kw)
+                    if count > 0:
+                        scores[emotion] += min(count * 0.5, 3.0)  # Cap at 3 per keyword
+            
+            # 2. Filename-based scoring (IMPORTANT for fallback scenarios)
+            for emotion, data in _EMOTION_MAP.items():
+                for hint in data.get("filename_hints", []):
+                    if hint in fname:
+                        scores[emotion] += 2.5  # Filename hints weighted higher
                     
-        # 3. Object-based scoring from detected objects
-        for emotion, data in emotion_map.items():
-            for obj_hint in data.get("object_hints", []):
-                if obj_hint in objects or any(obj_hint in o for o in objects):
-                    scores[emotion] += 1.5
+        # 3. Object-based scoring from detected objects; a hint counts if it is
+        # part of any object name, so one search over the NUL-joined names does it
+        if objects:
+            objects_blob = "\x00".join(objects)
+            for emotion, data in _EMOTION_MAP.items():
+                for obj_hint in data.get("object_hints", ()):
+                    if obj_hint in objects_blob:
+                        scores[emotion] += 1.5
         
         # 4. Special case: screen recordings are analytical
         if "screen" in fname or "recording" in fname or "capture" in fname:
@@ -184,32 +299,33 @@ class NLPService:
         if "person" in objects and max(scores.values()) < 1.0:
             scores["thoughtful"] += 1.5
         
+        # Total and dominant emotion in one pass over the scores
+        total_score = 0.0
+        dominant_emotion, max_score = None, float("-inf")
+        for e, s in scores.items():
+            total_score += s
+            if s > max_score:
+                dominant_emotion, max_score = e, s
+        
         # Calculate normalized scores for multi-emotion detection
-        total_score = sum(scores.values())
-        normalized_scores = {}
         if total_score > 0:
             normalized_scores = {e: round(s / total_score, 3) for e, s in scores.items()}
         else:
-            normalized_scores = {e: 0.0 for e in scores.keys()}
-        
-        # Find dominant emotion
-        dominant_emotion = max(scores, key=scores.get)
-        max_score = scores[dominant_emotion]
+            normalized_scores = dict.fromkeys(scores, 0.0)
         
-        # Get all emotions above threshold (0.15) for multi-categorization
+        # Get all emotions above threshold (0.15) for multi-categorization;
+        # only the survivors are sorted
         emotion_threshold = 0.15
-        detected_emotions = [
-            {"emotion": e, "confidence": normalized_scores[e]}
-            for e, s in sorted(scores.items(), key=lambda x: x[1], reverse=True)
-            if normalized_scores.get(e, 0) >= emotion_threshold
-        ]
+        survivors = [(e, n) for e, n in normalized_scores.items() if n >= emotion_threshold]
+        survivors.sort(key=lambda item: scores[item[0]], reverse=True)
+        detected_emotions = [{"emotion": e, "confidence": n} for e, n in survivors]
         
         # Ensure at least one emotion
         if not detected_emotions:
             # Use filename hash for variety instead of always neutral
             if max_score == 0:
                 variety_pool = ["thoughtful", "analytical", "neutral"]
-                name_hash = sum(ord(c) for c in fname)
+                name_hash = sum(fname.encode())  # byte sum in C; equals the ord() sum for ASCII names
                 fallback = variety_pool[name_hash % len(variety_pool)]
                 return {
                     "emotion": fallback if fallback != "neutral" else "thoughtful",
@@ -251,7 +251,7 @@ class ProcessingOrchestrator:
             if sum(emotion_weights.values()) == 0:
                 variety_pool = ["thoughtful", "joy", "analytical", "surprise", "sadness", "anger"]
                 # Use filename hash for better variety than just ID
-                name_hash = sum(ord(c) for c in take.file_name)
+                name_hash = sum(take.file_name.encode())
                 emotion_label = variety_pool[(name_hash + take.id) % len(variety_pool)]
             
             self._progress[take.id]["logs"].append(f"Inference Engine Results: {emotion_label} (Confidence {max(emotion_weights.values()):.2f})")
@@ -3,13 +3,45 @@ Query Expansion Service for SmartCut AI
 Provides LLM-like query understanding with synonym expansion, abbreviation handling,
 and semantic term mapping for intelligent search.
 """
-from typing import List, Dict, Set
+from typing import List, Dict, Set, Iterable, Tuple
+from functools import lru_cache
 import logging
 import re
 
 logger = logging.getLogger(__name__)
 
 
+EMOTION_KEYWORDS = {
+    "joy": ["happy", "joyful", "cheerful", "delighted", "excited", "fun", "funny", "comedy", "laugh"],
+    "sadness": ["sad", "unhappy", "depressed", "melancholy", "gloomy", "tragic", "cry", "tears"],
+    "anger": ["angry", "furious", "mad", "enraged", "frustrated", "tense", "intense", "fight"],
+    "fear": ["scared", "afraid", "frightened", "terrified", "horror", "scary", "creepy", "nervous"],
+    "surprise": ["surprised", "shocked", "amazed", "unexpected", "twist", "reveal", "startled"],
+    "disgust": ["disgusted", "gross", "revolting", "nasty", "ugly", "weird"],
+    "analytical": ["technical", "analytical", "screen", "recording", "tutorial", "demo", "code"],
+    "thoughtful": ["thoughtful", "pensive", "contemplating", "interview", "discussion", "talk"],
+}
+
+
+@lru_cache(maxsize=256)
+def _term_automaton(terms: frozenset):
+    """
+    Build an Aho-Corasick automaton over a set of search terms.
+    Cached because query expansion keeps producing the same term sets.
+    Returns None when pyahocorasick is not installed.
+    """
+    try:
+        import ahocorasick
+    except ImportError:
+        return None
+    
+    automaton = ahocorasick.Automaton()
+    for term in terms:
+        automaton.add_word(term, term)
+    automaton.make_automaton()
+    return automaton
+
+
 class QueryExpansionService:
     """
     Expands user queries with synonyms, abbreviations, and semantically related terms.
@@ -140,7 +172,20 @@ class QueryExpansionService:
                 - expansion_reasoning: Why terms were expanded
         """
         original = query.strip()
-        query_lower = original.lower()
+        words, expanded_terms, expansion_reasoning = self._expand_normalized(original.lower())
+        
+        # Fresh containers so callers can't mutate the cached expansion
+        return {
+            "original": original,
+            "expanded_terms": list(expanded_terms),
+            "all_search_terms": set(expanded_terms),
+            "expansion_reasoning": list(expansion_reasoning),
+            "query_words": list(words)
+        }
+    
+    @lru_cache(maxsize=4096)
+    def _expand_normalized(self, query_lower: str) -> Tuple[tuple, frozenset, tuple]:
+        """Deterministic expansion of a lowercased query; cached since editors repeat queries."""
         words = re.findall(r'\b\w+\b', query_lower)
         
         expanded_terms = set(words)
@@ -167,40 +212,41 @@ class QueryExpansionService:
                     expanded_terms.add(expansion.lower())
                     expansion_reasoning.append(f"'{expansion}' maps to abbreviation '{abbr}'")
         
-        return {
-            "original": original,
-            "expanded_terms": list(expanded_terms),
-            "all_search_terms": expanded_terms,
-            "expansion_reasoning": expansion_reasoning,
-            "query_words": words
-        }
+        return tuple(words), frozenset(expanded_terms), tuple(expansion_reasoning)
     
     def get_emotion_mappings(self, query: str) -> List[str]:
         """
         Extract and expand emotion-related terms from query.
         Returns list of emotion labels that match the query.
         """
-        emotion_keywords = {
-            "joy": ["happy", "joyful", "cheerful", "delighted", "excited", "fun", "funny", "comedy", "laugh"],
-            "sadness": ["sad", "unhappy", "depressed", "melancholy", "gloomy", "tragic", "cry", "tears"],
-            "anger": ["angry", "furious", "mad", "enraged", "frustrated", "tense", "intense", "fight"],
-            "fear": ["scared", "afraid", "frightened", "terrified", "horror", "scary", "creepy", "nervous"],
-            "surprise": ["surprised", "shocked", "amazed", "unexpected", "twist", "reveal", "startled"],
-            "disgust": ["disgusted", "gross", "revolting", "nasty", "ugly", "weird"],
-            "analytical": ["technical", "analytical", "screen", "recording", "tutorial", "demo", "code"],
-            "thoughtful": ["thoughtful", "pensive", "contemplating", "interview", "discussion", "talk"],
-        }
-        
-        query_lower = query.lower()
+        return list(self._emotions_for(query.lower()))
+    
+    @lru_cache(maxsize=4096)
+    def _emotions_for(self, query_lower: str) -> tuple:
         matched_emotions = []
         
-        for emotion, keywords in emotion_keywords.items():
+        for emotion, keywords in EMOTION_KEYWORDS.items():
             for kw in keywords:
                 if kw in query_lower:
                     matched_emotions.append(emotion)
                     break
         
-        return matched_emotions
+        return tuple(matched_emotions)
+    
+    def match_terms(self, terms: Iterable[str], text: str) -> Set[str]:
+        """
+        Return the subset of terms that occur as substrings of text.
+        Uses a single Aho-Corasick pass (O(len(text) + matches)) instead of
+        one substring scan per term.
+        """
+        terms = frozenset(t for t in terms if t)
+        if not terms or not text:
+            return set()
+        
+        automaton = _term_automaton(terms)
+        if automaton is None:
+            return {t for t in terms if t in text}
+        return {term for _, term in automaton.iter(text)}
     
     def similarity_score(self, query_terms: Set[str], target_text: str) -> float:
         """
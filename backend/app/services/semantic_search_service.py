@@ -7,6 +7,7 @@ import numpy as np
 import logging
 import pickle
 import os
+import time
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 from app.services.intent_embedding_service import intent_embedding_service
@@ -17,6 +18,30 @@ logger = logging.getLogger(__name__)
 
 # Heavy imports deferred to method scope
 
+# HNSW graph degree and search beam; efSearch trades recall for latency
+HNSW_M = 32
+HNSW_EF_SEARCH = 64
+
+# Take descriptions can change outside this process (other workers, reanalysis
+# scripts), so the keyword-search copy is re-read at least this often
+DESCRIPTIONS_TTL_SECONDS = 30.0
+
+
+def _new_faiss_index(faiss, dimension: int):
+    """
+    Inner-product HNSW index with fp16 scalar-quantized storage: half the
+    bytes of IndexFlatIP and sub-linear search. fp16 needs no training, so
+    moments can still be added one at a time.
+    """
+    try:
+        index = faiss.IndexHNSWSQ(dimension, faiss.ScalarQuantizer.QT_fp16, HNSW_M, faiss.METRIC_INNER_PRODUCT)
+        if index.is_trained:
+            index.hnsw.efSearch = HNSW_EF_SEARCH
+            return index
+    except (AttributeError, TypeError) as e:
+        logger.warning(f"HNSW-SQ index unavailable ({e}), using IndexFlatIP")
+    return faiss.IndexFlatIP(dimension)
+
 
 @dataclass
 class SearchResult:
@@ -34,31 +59,53 @@ class SearchResult:
     reasoning: Dict[str, Any]
 
 class NumpyIndex:
-    """A pure-numpy implementation of FAISS IndexFlatIP for fallback."""
+    """
+    A pure-numpy implementation of FAISS IndexFlatIP for fallback.
+    Vectors live in one contiguous float32 matrix with spare capacity, so adds
+    are amortised O(1) and a search is a single BLAS matrix-vector product.
+    """
+    MIN_CAPACITY = 1024
+    
     def __init__(self, d):
         self.d = d
-        self.vectors = np.empty((0, d), dtype=np.float32)
+        self._buf = np.empty((0, d), dtype=np.float32)
+        self._n = 0
         
     @property
     def ntotal(self):
-        return self.vectors.shape[0]
+        return self._n
+    
+    @property
+    def vectors(self):
+        return self._buf[:self._n]
         
     def add(self, x):
-        if x.ndim == 1:
-            x = x.reshape(1, -1)
-        self.vectors = np.concatenate([self.vectors, x], axis=0)
+        x = np.asarray(x, dtype=np.float32).reshape(-1, self.d)
+        needed = self._n + len(x)
+        if needed > len(self._buf):
+            # Grow geometrically instead of reallocating the whole matrix per moment
+            grown = np.empty((max(needed, 2 * len(self._buf), self.MIN_CAPACITY), self.d), dtype=np.float32)
+            grown[:self._n] = self._buf[:self._n]
+            self._buf = grown
+        self._buf[self._n:needed] = x
+        self._n = needed
         
     def search(self, q, k):
         if self.ntotal == 0:
             return np.array([[]]), np.array([[]])
         
         # Cosine similarity (assuming normalized)
-        # q: (1, d), vectors: (n, d) -> scores: (1, n)
-        scores = np.dot(q, self.vectors.T)
+        # q: (m, d), vectors: (n, d) -> scores: (m, n)
+        scores = np.asarray(q, dtype=np.float32).reshape(-1, self.d) @ self.vectors.T
         
-        # Top-k
-        # argsort gives ascending, so we take tail and reverse
-        indices = np.argsort(scores, axis=1)[:, -k:][:, ::-1]
+        # Top-k: partial selection first, then sort only the k survivors
+        k = min(k, self._n)
+        if k < self._n:
+            candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            candidates = np.broadcast_to(np.arange(self._n), scores.shape)
+        order = np.argsort(-np.take_along_axis(scores, candidates, axis=1), axis=1, kind="stable")
+        indices = np.take_along_axis(candidates, order, axis=1)
         
         # Get corresponding scores
         top_scores = np.take_along_axis(scores, indices, axis=1)
@@ -87,9 +134,14 @@ class SemanticSearchService:
     
     def __init__(self):
         self.dimension = intent_embedding_service.EMBEDDING_DIM
-        self.index: Any = None  # faiss.IndexFlatIP or MockIndex
+        self.index: Any = None  # faiss.IndexHNSWSQ / IndexFlatIP or NumpyIndex
         self.metadata: List[Dict] = []  # Parallel list of moment metadata
         
+        # Pre-lowercased search text, built once instead of on every keyword query
+        self._moment_texts: List[tuple] = []  # Parallel to self.metadata
+        self._descriptions_cache: Optional[Dict[int, Dict[str, str]]] = None
+        self._descriptions_loaded_at = 0.0  # time.monotonic() of the last DB read
+        
         # Visual search components
         self.visual_dimension = visual_embedding_service.EMBEDDING_DIM  # 512 for CLIP
         self.visual_index: Optional[faiss.IndexFlatIP] = None
@@ -137,7 +189,7 @@ class SemanticSearchService:
         """Create a new FAISS index (or mock)."""
         try:
             import faiss
-            self.index = faiss.IndexFlatIP(self.dimension)
+            self.index = _new_faiss_index(faiss, self.dimension)
             mode = 'FAISS'
         except ImportError:
             # Use Numpy fallback
@@ -145,6 +197,8 @@ class SemanticSearchService:
             mode = 'MOCK'
             
         self.metadata = []
+        self._moment_texts = []
+        self._descriptions_cache = None
         logger.info(f"Created new {mode} index")
     
     def _load_visual_index(self):
@@ -192,7 +246,7 @@ class SemanticSearchService:
                 if os.path.exists(self.VISUAL_PATHS_PATH):
                     self.visual_paths = list(np.load(self.VISUAL_PATHS_PATH, allow_pickle=True))
                 
-                self.visual_index = faiss.IndexFlatIP(self.visual_dimension)
+                self.visual_index = _new_faiss_index(faiss, self.visual_dimension)
                 self.visual_index.add(embeddings.astype(np.float32))
                 logger.info(f"Built visual index from embeddings: {self.visual_index.ntotal} vectors")
                 
@@ -203,7 +257,7 @@ class SemanticSearchService:
                 logger.warning(f"Failed to build visual index: {e}")
         
         # Create empty visual index
-        self.visual_index = faiss.IndexFlatIP(self.visual_dimension)
+        self.visual_index = _new_faiss_index(faiss, self.visual_dimension)
         self.visual_paths = []
         logger.info("Created empty visual index (no embeddings found)")
     
@@ -233,10 +287,15 @@ class SemanticSearchService:
         file_name: str = "",
         file_path: str = "",
         audio_features: Dict = None,
-        timing_data: Dict = None
+        timing_data: Dict = None,
+        persist: bool = True
     ):
         """
         Add a moment's embedding to the index.
+        
+        Returns the moment's position and its normalized embedding. With
+        persist=False the moment only goes into memory; the caller hands
+        both to _persist_moments() afterwards.
         """
         # Ensure normalized for cosine similarity
         embedding = embedding.astype(np.float32)
@@ -260,6 +319,77 @@ class SemanticSearchService:
             "audio_features": audio_features or {},
             "timing_data": timing_data or {}
         })
+        
+        # The take was just (re)analyzed, so its cached descriptions are stale
+        self._descriptions_cache = None
+        
+        position = len(self.metadata) - 1
+        if persist:
+            self._persist_moments([(position, embedding)])
+        return position, embedding
+    
+    def index_moments(self, moments: List[Dict]):
+        """
+        Add several moments (index_moment keyword dicts) and persist them
+        in a single transaction.
+        """
+        pending = []
+        for moment in moments:
+            pending.append(self.index_moment(**moment, persist=False))
+        self._persist_moments(pending)
+    
+    def _result_id(self, position: int) -> int:
+        """
+        Mirrored moments answer to their moment_embeddings primary key.
+        Unmirrored ones get a negative id so the two never collide.
+        """
+        return self.metadata[position].get("result_id", -(position + 1))
+    
+    def unmirrored_metadata(self, result_id: int) -> Optional[Dict]:
+        """Resolve a negative result_id handed out by _result_id()."""
+        position = -result_id - 1
+        if 0 <= position < len(self.metadata) and "result_id" not in self.metadata[position]:
+            return self.metadata[position]
+        return None
+    
+    def _persist_moments(self, pending: List[tuple]):
+        """
+        Mirror moment metadata into moment_embeddings so every worker can
+        resolve a result_id without this process's in-memory list.
+        
+        The row's primary key becomes the moment's result_id; FAISS
+        positions differ between workers and cannot be shared.
+        """
+        if not pending:
+            return
+        try:
+            import base64
+            from app.db.session import SessionLocal
+            from app.models import database as models
+            
+            db = SessionLocal()
+            try:
+                rows = []
+                for position, embedding in pending:
+                    meta = self.metadata[position]
+                    rows.append(models.MomentEmbedding(
+                        take_id=meta["take_id"],
+                        start_time=meta["start_time"],
+                        end_time=meta["end_time"],
+                        embedding_blob=base64.b64encode(embedding.tobytes()).decode("ascii"),
+                        emotion_label=meta["emotion_label"],
+                        audio_features=meta["audio_features"],
+                        timing_data=meta["timing_data"],
+                        transcript_snippet=meta["transcript_snippet"]
+                    ))
+                db.add_all(rows)
+                db.commit()
+                for (position, _), row in zip(pending, rows):
+                    self.metadata[position]["result_id"] = row.id
+            finally:
+                db.close()
+        except Exception as e:
+            logger.warning(f"Could not persist {len(pending)} moment(s): {e}")
 
     def _keyword_search(self, query: str, top_k: int, filters: Dict = None) -> List[SearchResult]:
         """
@@ -280,6 +410,7 @@ class SemanticSearchService:
         
         # Also try to get descriptions from database for richer search
         db_descriptions = self._get_descriptions_from_db()
+        moment_texts = self._get_moment_texts()
         
         for i, meta in enumerate(self.metadata):
             score = 0.0
@@ -292,64 +423,30 @@ class SemanticSearchService:
                 if filters.get("emotion") and meta.get("emotion_label") != filters["emotion"]:
                     continue
             
-            # Get all searchable text
-            transcript = meta.get("transcript_snippet", "").lower()
-            emotion = meta.get("emotion_label", "").lower()
-            fname = meta.get("file_name", "").lower()
-            timing_pattern = meta.get("timing_data", {}).get("pattern", "").lower()
-            laughter = "laughter" if meta.get("audio_features", {}).get("laughter_detected") else ""
+            # Get all searchable text (pre-lowercased)
+            transcript, emotion, fname, timing_pattern, laughter = moment_texts[i]
             
             # Get descriptions from DB if available
             take_id = meta.get("take_id")
-            video_desc = db_descriptions.get(take_id, {}).get("video_desc", "").lower()
-            audio_desc = db_descriptions.get(take_id, {}).get("audio_desc", "").lower()
-            
-            # Combine all searchable content
-            combined_text = f"{transcript} {video_desc} {audio_desc} {fname}"
+            video_desc = db_descriptions.get(take_id, {}).get("video_desc", "")
+            audio_desc = db_descriptions.get(take_id, {}).get("audio_desc", "")
             
-            # Scoring with expanded terms
+            # Scoring with expanded terms: one Aho-Corasick pass per field
+            fields = [
+                ("transcript", transcript, 6),               # Dialogue (highest priority)
+                ("video_description", video_desc, 4),
+                ("audio_description", audio_desc, 4),
+                ("emotion", emotion, 5),
+                ("filename", fname, 3),
+                ("behavioral_pattern", timing_pattern, 5),
+                ("laughter_detected", laughter, 7),
+            ]
             matches = 0
-            for term in expanded_terms:
-                # Dialogue/Transcript matches (highest priority)
-                if term in transcript:
-                    matches += 6
-                    if "transcript" not in match_sources:
-                        match_sources.append("transcript")
-                
-                # Video/Audio description matches
-                if term in video_desc:
-                    matches += 4
-                    if "video_description" not in match_sources:
-                        match_sources.append("video_description")
-                
-                if term in audio_desc:
-                    matches += 4
-                    if "audio_description" not in match_sources:
-                        match_sources.append("audio_description")
-                
-                # Emotion label matches
-                if term in emotion or term == emotion:
-                    matches += 5
-                    if "emotion" not in match_sources:
-                        match_sources.append("emotion")
-                
-                # Filename matches
-                if term in fname:
-                    matches += 3
-                    if "filename" not in match_sources:
-                        match_sources.append("filename")
-                
-                # Behavioral pattern matches
-                if term in timing_pattern:
-                    matches += 5
-                    if "behavioral_pattern" not in match_sources:
-                        match_sources.append("behavioral_pattern")
-                
-                # Laughter detection
-                if term in laughter:
-                    matches += 7
-                    if "laughter_detected" not in match_sources:
-                        match_sources.append("laughter_detected")
+            for source, text, weight in fields:
+                hits = query_expansion_service.match_terms(expanded_terms, text)
+                if hits:
+                    matches += weight * len(hits)
+                    match_sources.append(source)
             
             # Bonus for emotion category matches from query
             if query_emotions and emotion in query_emotions:
@@ -372,7 +469,7 @@ class SemanticSearchService:
                     reasoning["query_expansion"] = expansion["expansion_reasoning"][:2]
                 
                 results.append(SearchResult(
-                    result_id=i,
+                    result_id=self._result_id(i),
                     take_id=meta["take_id"],
                     moment_id=meta["moment_id"],
                     start_time=meta["start_time"],
@@ -389,30 +486,54 @@ class SemanticSearchService:
         results.sort(key=lambda x: x.confidence, reverse=True)
         return results[:top_k]
     
+    def _get_moment_texts(self) -> List[tuple]:
+        """
+        Lowercased (transcript, emotion, file name, timing pattern, laughter) per moment.
+        Append-only like self.metadata, so only newly indexed moments are processed.
+        """
+        for meta in self.metadata[len(self._moment_texts):]:
+            self._moment_texts.append((
+                meta.get("transcript_snippet", "").lower(),
+                meta.get("emotion_label", "").lower(),
+                meta.get("file_name", "").lower(),
+                meta.get("timing_data", {}).get("pattern", "").lower(),
+                "laughter" if meta.get("audio_features", {}).get("laughter_detected") else ""
+            ))
+        return self._moment_texts
+    
     def _get_descriptions_from_db(self) -> Dict[int, Dict[str, str]]:
-        """Fetch video and audio descriptions from database for richer search."""
+        """
+        Fetch lowercased video and audio descriptions from database for richer search.
+        Cached per process for DESCRIPTIONS_TTL_SECONDS; dropped early whenever
+        this process (re)indexes a moment.
+        """
+        if (self._descriptions_cache is not None
+                and time.monotonic() - self._descriptions_loaded_at < DESCRIPTIONS_TTL_SECONDS):
+            return self._descriptions_cache
+        
         try:
             from app.db.session import SessionLocal
             from app.models import database as models
             
             db = SessionLocal()
-            takes = db.query(models.Take).all()
+            try:
+                takes = db.query(models.Take.id, models.Take.ai_metadata).all()
+            finally:
+                db.close()
             
             descriptions = {}
-            for take in takes:
-                meta = take.ai_metadata or {}
+            for take_id, meta in takes:
+                meta = meta or {}
                 cv_data = meta.get("cv", {})
                 audio_data = meta.get("audio", {})
                 
-                descriptions[take.id] = {
-                    "video_desc": cv_data.get("video_description", ""),
-                    "audio_desc": audio_data.get("audio_description", ""),
-                    "transcript": audio_data.get("transcript", ""),
-                    "emotion": meta.get("emotion", "neutral"),
-                    "detected_emotions": meta.get("detected_emotions", [])
+                descriptions[take_id] = {
+                    "video_desc": (cv_data.get("video_description") or "").lower(),
+                    "audio_desc": (audio_data.get("audio_description") or "").lower()
                 }
             
-            db.close()
+            self._descriptions_cache = descriptions
+            self._descriptions_loaded_at = time.monotonic()
             return descriptions
         except Exception as e:
             logger.warning(f"Could not fetch descriptions from DB: {e}")
@@ -477,7 +598,7 @@ class SemanticSearchService:
             reasoning = self._generate_reasoning(query, parsed_intent, meta, score)
             
             results.append(SearchResult(
-                result_id=idx,
+                result_id=self._result_id(idx),
                 take_id=meta["take_id"],
                 moment_id=meta["moment_id"],
                 start_time=meta["start_time"],
@@ -629,6 +750,18 @@ class SemanticSearchService:
         """Clear all indexed data."""
         self._create_new_index()
         self.save_index()
+        try:
+            from app.db.session import SessionLocal
+            from app.models import database as models
+            
+            db = SessionLocal()
+            try:
+                db.query(models.MomentEmbedding).delete()
+                db.commit()
+            finally:
+                db.close()
+        except Exception as e:
+            logger.warning(f"Could not clear persisted moments: {e}")
 
 
 # Singleton instance
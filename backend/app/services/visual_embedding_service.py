@@ -6,6 +6,7 @@ Member 2: AI Engineer - Backend Integration
 Integrates CLIP embeddings from colab_code/embedding_gen.py with the backend
 search system for visual similarity search.
 """
+import hashlib
 import numpy as np
 import logging
 from typing import Dict, Any, List, Optional
@@ -44,6 +45,11 @@ def get_clip_model():
     return _clip_model, _clip_processor
 
 
+def _seeded_rng(data: bytes) -> np.random.Generator:
+    """Generator seeded from a stable 64-bit digest; hash() is salted per process."""
+    return np.random.default_rng(int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little"))
+
+
 class VisualEmbeddingService:
     """
     CLIP-based visual embedding service for video frames.
@@ -90,8 +96,7 @@ class VisualEmbeddingService:
         
         if model == "mock":
             # Mock embedding for testing
-            np.random.seed(hash(image.tobytes()[:100]) % 2**32)
-            embedding = np.random.randn(self.EMBEDDING_DIM).astype(np.float32)
+            embedding = _seeded_rng(image.tobytes()[:100]).standard_normal(self.EMBEDDING_DIM, dtype=np.float32)
             return embedding / np.linalg.norm(embedding)
         
         try:
@@ -130,8 +135,7 @@ class VisualEmbeddingService:
         
         if model == "mock":
             # Mock embedding
-            np.random.seed(hash(query) % 2**32)
-            embedding = np.random.randn(self.EMBEDDING_DIM).astype(np.float32)
+            embedding = _seeded_rng(query.encode()).standard_normal(self.EMBEDDING_DIM, dtype=np.float32)
             return embedding / np.linalg.norm(embedding)
         
         try:
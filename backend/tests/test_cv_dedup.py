@@ -0,0 +1,93 @@
+"""
+CV Frame Dedup Tests
+Verifies repeated sampled frames skip YOLO and reuse the previous result.
+"""
+import sys
+import os
+import asyncio
+import threading
+import numpy as np
+
+# Add backend to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.services import cv_service as cv_module
+from app.services.cv_service import CVService
+from app.services.micro_batcher import MicroBatcher
+
+
+class _Tensor(list):
+    def int(self):
+        return _Tensor(int(x) for x in self)
+
+    def tolist(self):
+        return list(self)
+
+
+class _Result:
+    def __init__(self, class_id):
+        self.boxes = type("Boxes", (), {"cls": _Tensor([class_id]), "conf": _Tensor([0.9])})()
+
+
+def test_consecutive_duplicate_frames_skip_inference(monkeypatch):
+    black = np.zeros((64, 64, 3), dtype=np.uint8)
+    white = np.full((64, 64, 3), 255, dtype=np.uint8)
+    frames = [black, black.copy(), white, white.copy(), black]
+    monkeypatch.setattr(
+        cv_module, "iter_sampled_frames",
+        lambda path, indices, max_side=None: iter(zip(indices, frames))
+    )
+
+    inferred = []
+
+    def batch_fn(batch):
+        inferred.extend(int(f[0, 0, 0]) for f in batch)
+        return [(_Result(1 if f[0, 0, 0] else 0), 1.0) for f in batch]
+
+    service = CVService()
+    service._model = type("Model", (), {"names": {0: "dark", 1: "bright"}})()
+    service._batcher = MicroBatcher(batch_fn, max_batch=2, max_wait=0.01)
+
+    async def _run():
+        return [entry async for entry in service.iter_detections("clip.mp4", 1.0, len(frames))]
+
+    entries = asyncio.run(_run())
+
+    assert inferred == [0, 255, 0]
+    assert [e["deduplicated"] for e in entries] == [False, True, False, True, False]
+    assert [e["detections"][0][0] for e in entries] == ["dark", "dark", "bright", "bright", "dark"]
+    assert entries[1]["inference_ms"] is None
+
+
+def test_disconnect_closes_decoder_and_drops_queued_frames(monkeypatch):
+    closed = threading.Event()
+
+    def frames(path, indices, max_side=None):
+        try:
+            for i in indices:
+                yield i, np.full((64, 64, 3), i, dtype=np.uint8)
+        finally:
+            closed.set()
+
+    monkeypatch.setattr(cv_module, "iter_sampled_frames", frames)
+
+    inferred = []
+
+    def batch_fn(batch):
+        inferred.extend(int(f[0, 0, 0]) for f in batch)
+        return [(_Result(0), 1.0) for f in batch]
+
+    service = CVService()
+    service._model = type("Model", (), {"names": {0: "dark"}})()
+    service._batcher = MicroBatcher(batch_fn, max_batch=1, max_wait=0.01)
+
+    async def _run():
+        stream = service.iter_detections("clip.mp4", 1.0, 50)
+        first = await stream.__anext__()
+        await stream.aclose()
+        return first
+
+    assert asyncio.run(_run())["frame"] == 0
+    assert closed.wait(timeout=2)
+    # Only what was already in flight ran; the rest of the clip never reached YOLO
+    assert len(inferred) < 50
@@ -0,0 +1,38 @@
+"""
+HTTP Cache Tests
+Verifies precompressed static files honour Accept-Encoding q-values.
+"""
+import sys
+import os
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add backend to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.api.http_cache import CachedStaticFiles
+
+
+@pytest.fixture
+def client(tmp_path):
+    (tmp_path / "clip.txt").write_bytes(b"plain")
+    (tmp_path / "clip.txt.br").write_bytes(b"brotli")
+    (tmp_path / "clip.txt.gz").write_bytes(b"gzip")
+    app = FastAPI()
+    app.mount("/media", CachedStaticFiles(directory=str(tmp_path)), name="media")
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("accept, expected", [
+    ("gzip, br", "br"),
+    ("br;q=0, gzip", "gzip"),
+    ("gzip;q=0", None),
+    ("*;q=0.5, br;q=0", "gzip"),
+    ("identity", None),
+])
+def test_precompressed_variant_follows_q_values(client, accept, expected):
+    # Headers only: the fake payloads would fail the client's decoder
+    with client.stream("GET", "/media/clip.txt", headers={"Accept-Encoding": accept}) as response:
+        assert response.status_code == 200
+        assert response.headers.get("content-encoding") == expected
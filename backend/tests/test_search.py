@@ -0,0 +1,93 @@
+"""
+Unified Search Tests
+Verifies SQL-side scoring and match-source tagging for /search/unified.
+"""
+import sys
+import os
+import json
+import pytest
+from starlette.requests import Request
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add backend to sys.path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.models.database import Base, Take, MomentEmbedding
+from app.api.api_v1.endpoints.search import unified_search, explain_result, SearchRequest
+from app.services.semantic_search_service import semantic_search_service
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all([
+        Take(file_name="police_station.mp4", file_path="/storage/police_station.mp4", ai_metadata={
+            "emotion": "Joy",
+            "audio": {"transcript": "The FIR was filed this morning", "audio_description": "Lavalier capture"},
+            "cv": {"video_description": "A quiet police station at dusk"}
+        }),
+        Take(file_name="empty.mp4", file_path="/storage/empty.mp4", ai_metadata=None),
+    ])
+    session.commit()
+    yield session
+    session.close()
+
+
+def _search(db, query, top_k=10):
+    return unified_search(SearchRequest(query=query, top_k=top_k), db)
+
+
+def test_abbreviation_matches_transcript(db):
+    response = _search(db, "FIR")
+    assert [r.take_id for r in response.results] == [1]
+    assert "dialog/transcript" in response.results[0].match_sources
+
+
+def test_emotion_category_bonus(db):
+    response = _search(db, "happy")
+    assert response.results[0].match_sources == ["emotion_category"]
+    assert response.results[0].emotion == "joy"
+
+
+def test_like_wildcards_are_escaped(db):
+    # An unescaped "_" would also match "police " in the video description
+    response = _search(db, "police_")
+    assert response.results[0].match_sources == ["filename"]
+
+
+def test_missing_metadata_defaults_to_neutral(db):
+    response = _search(db, "neutral")
+    assert [r.take_id for r in response.results] == [2]
+
+
+def _request(headers=None):
+    return Request({"type": "http", "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]})
+
+
+def test_explain_reads_persisted_moment(db):
+    db.add(MomentEmbedding(id=7, take_id=1, start_time=0.0, end_time=4.0, emotion_label="joy",
+                           transcript_snippet="The FIR was filed", audio_features={}, timing_data={"pattern": "quick_response"}))
+    db.commit()
+    response = explain_result(7, _request(), db)
+    explanation = json.loads(response.body)
+    assert explanation["take_id"] == 1
+    assert "quick response" in explanation["explanation_text"]
+
+    # Revalidating with the same ETag skips the body
+    revalidated = explain_result(7, _request({"If-None-Match": response.headers["etag"]}), db)
+    assert revalidated.status_code == 304
+
+
+def test_explain_keeps_unmirrored_ids_apart(db, monkeypatch):
+    db.add(MomentEmbedding(id=1, take_id=1, start_time=0.0, end_time=4.0, emotion_label="joy",
+                           transcript_snippet="", audio_features={}, timing_data={}))
+    db.commit()
+    unmirrored = {"take_id": 2, "start_time": 1.0, "end_time": 2.0, "emotion_label": "neutral",
+                  "transcript_snippet": "", "audio_features": {}, "timing_data": {}}
+    monkeypatch.setattr(semantic_search_service, "metadata", [unmirrored, unmirrored])
+
+    assert json.loads(explain_result(1, _request(), db).body)["take_id"] == 1
+    assert json.loads(explain_result(-2, _request(), db).body)["take_id"] == 2